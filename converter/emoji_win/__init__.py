@@ -19,11 +19,27 @@ __version__ = "1.0.0"
 __author__ = "jjjuk"
 __license__ = "MIT"
 
-# Import main functions for easy access
-from .font_converter import convert_apple_emoji_to_windows
-from .font_diagnostics import diagnose_cbdt_cblc_directwrite_issues, analyze_font_structure
-from .bitmap_processor import fix_cbdt_cblc_sizes_for_directwrite
-from .cli import main
+# Main functions for easy access, imported on first use so that loading the
+# package (e.g. for the CLI) doesn't pull in fontTools and Pillow up front
+_LAZY_EXPORTS = {
+    "convert_apple_emoji_to_windows": ".font_converter",
+    "diagnose_cbdt_cblc_directwrite_issues": ".font_diagnostics",
+    "analyze_font_structure": ".font_diagnostics",
+    "fix_cbdt_cblc_sizes_for_directwrite": ".bitmap_processor",
+    "main": ".cli",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "convert_apple_emoji_to_windows",
@@ -9,9 +9,46 @@ Author: jjjuk
 License: MIT
 """
 
+import bisect
+import hashlib
 import io
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
 from PIL import Image
 
+# Glyphs are shipped to worker processes in batches to amortize pickling overhead
+PARALLEL_CHUNKSIZE = 64
+# Below this many glyphs the process pool startup costs more than it saves
+PARALLEL_MIN_GLYPHS = 256
+# PNGs smaller than this many bytes are resized on threads rather than pickled to
+# worker processes; override with the EMOJI_WIN_IPC_THRESHOLD environment variable
+IPC_THRESHOLD = 4096
+# Fast zlib setting for re-encoded PNGs; re-encoding dominates resize time otherwise
+PNG_COMPRESS_LEVEL = 1
+# Byte offset of the PNG payload in a raw CBDT glyph record, by image format
+# (17: small metrics + uint32 length, 18: big metrics + uint32 length, 19: uint32 length)
+CBDT_PNG_OFFSETS = {17: 9, 18: 12, 19: 4}
+PNG_SIGNATURE = b'\x89PNG'
+# Glyph metrics at the start of a raw CBDT record, by header length
+# (5: SmallGlyphMetrics of format 17, 8: BigGlyphMetrics of format 18)
+GLYPH_METRICS_STRUCTS = {5: struct.Struct('>BBbbB'), 8: struct.Struct('>BBbbBbbB')}
+# CBDT only stores PNG, so Pillow can skip probing every other image plugin
+PIL_FORMATS = ('PNG',)
+LANCZOS = Image.Resampling.LANCZOS
+# Minimum seconds between glyph progress reports, so redraws don't compete with resizing
+PROGRESS_INTERVAL = 0.1
+# DirectWrite preferred sizes (kept sorted for bisect)
+DIRECTWRITE_SIZES = (16, 20, 24, 32, 40, 48, 64, 96, 128)
+
+# Per-thread PNG encode buffer, reset and reused for every glyph
+_encode_buffers = threading.local()
+
 
 def fix_cbdt_cblc_sizes_for_directwrite(font, progress_callback=None, quiet=False):
     """
@@ -34,14 +71,14 @@ def fix_cbdt_cblc_sizes_for_directwrite(font, progress_callback=None, quiet=Fals
     cblc = font["CBLC"]
     cbdt = font["CBDT"]
 
-    # DirectWrite preferred sizes
-    directwrite_sizes = [16, 20, 24, 32, 40, 48, 64, 96, 128]
-
     log(f"Found {len(cblc.strikes)} bitmap strikes to analyze")
 
     strikes_modified = 0
     total_strikes = len(cblc.strikes)
 
+    # Shared across strikes, since the same bitmap often appears in several of them
+    resize_cache = {}
+
     for i, strike in enumerate(cblc.strikes):
         if progress_callback:
             progress_callback(i, total_strikes, f"Analyzing strike {i+1}/{total_strikes}")
@@ -62,7 +99,7 @@ def fix_cbdt_cblc_sizes_for_directwrite(font, progress_callback=None, quiet=Fals
 
         # Find closest DirectWrite size
         current_max = max(current_size)
-        closest_size = min(directwrite_sizes, key=lambda x: abs(x - current_max))
+        closest_size = closest_directwrite_size(current_max)
 
         if current_max == closest_size:
             log(f"  ✓ Size {current_max} already DirectWrite compatible")
@@ -72,14 +109,18 @@ def fix_cbdt_cblc_sizes_for_directwrite(font, progress_callback=None, quiet=Fals
 
         try:
             # Method 1: Try to resize actual bitmap data
-            def glyph_progress_callback(current, total, description):
-                if progress_callback:
+            glyph_progress_callback = None
+            if progress_callback:
+                def glyph_progress_callback(current, total, description):
                     # Report detailed progress for this strike
                     strike_progress = (i + (current / total)) / total_strikes
                     progress_callback(strike_progress * total_strikes, total_strikes,
                                     f"Strike {i+1}/{total_strikes}: {description}")
 
-            success = resize_strike_bitmaps(font, i, closest_size, glyph_progress_callback, log)
+            # Probe IHDR headers first so a strike with nothing to resize never decodes pixels
+            probes = probe_strike(font, i, log)
+            success = bool(probes) and apply_resize(font, i, probes, closest_size,
+                                                    glyph_progress_callback, log, resize_cache)
             if success:
                 strikes_modified += 1
                 log(f"  ✓ Successfully resized bitmap data for strike {i}")
@@ -104,103 +145,377 @@ def fix_cbdt_cblc_sizes_for_directwrite(font, progress_callback=None, quiet=Fals
         return False
 
 
-def resize_strike_bitmaps(font, strike_index, new_size, progress_callback=None, log=print):
+def closest_directwrite_size(size):
+    """
+    Return the DirectWrite preferred size nearest to size (the smaller one on ties)
+    """
+    i = bisect.bisect_left(DIRECTWRITE_SIZES, size)
+    if i == 0:
+        return DIRECTWRITE_SIZES[0]
+    if i == len(DIRECTWRITE_SIZES):
+        return DIRECTWRITE_SIZES[-1]
+    below, above = DIRECTWRITE_SIZES[i - 1], DIRECTWRITE_SIZES[i]
+    return above if above - size < size - below else below
+
+
+def resize_strike_bitmaps(font, strike_index, new_size, progress_callback=None, log=print,
+                          resize_cache=None):
     """
     Resize all bitmaps in a specific strike to the new size using proper fonttools CBDT API
     """
+    probes = probe_strike(font, strike_index, log)
+    if not probes:
+        return False
+    return apply_resize(font, strike_index, probes, new_size, progress_callback, log, resize_cache)
+
+
+def probe_strike(font, strike_index, log=print):
+    """
+    Collect the PNG payloads of a strike without decoding any pixels
+
+    Returns a list of (bitmap_glyph, png_data, record_header) for every glyph whose
+    data carries a PNG IHDR header. record_header is the raw glyph record up to the
+    PNG length field, or None when the glyph had to be decompiled to find the PNG.
+    An empty list means nothing in the strike can be resized.
+    """
     cblc = font["CBLC"]
     cbdt = font["CBDT"]
 
     if strike_index >= len(cblc.strikes):
-        return False
+        return []
 
     strike = cblc.strikes[strike_index]
 
-    # Update the strike size information in CBLC
-    if hasattr(strike, 'bitmapSizeTable'):
-        bst = strike.bitmapSizeTable
-        if hasattr(bst, 'ppemX') and hasattr(bst, 'ppemY'):
-            bst.ppemX = new_size
-            bst.ppemY = new_size
-            log(f"    Updated CBLC strike size table to {new_size}x{new_size}")
-
     # Process each glyph bitmap in this strike using proper CBDT access
     if not hasattr(strike, 'indexSubTables') or not strike.indexSubTables:
         log(f"    ⚠ No index subtables found")
-        return False
-
-    bitmaps_resized = 0
-    total_glyphs = 0
-
-    # Get the glyph order to map glyph IDs to names
-    glyph_order = font.getGlyphOrder()
+        return []
 
     # Access CBDT strike data using correct fonttools API
     try:
         if not hasattr(cbdt, 'strikeData') or strike_index >= len(cbdt.strikeData):
             log(f"    ❌ No strike data found for strike {strike_index}")
-            return False
+            return []
 
         strike_data = cbdt.strikeData[strike_index]  # This is a dictionary of glyph_name -> bitmap_glyph
         total_glyphs_in_strike = len(strike_data)
 
         log(f"    Found {total_glyphs_in_strike} bitmap glyphs in strike {strike_index}")
 
-        # Process each glyph in the strike data
-        processed_count = 0
-        for glyph_name, bitmap_glyph in strike_data.items():
-            processed_count += 1
-            total_glyphs += 1
-
-            # Report progress for every 100 glyphs or at key milestones
-            if progress_callback and (processed_count % 100 == 0 or processed_count == total_glyphs_in_strike):
-                progress_callback(processed_count, total_glyphs_in_strike,
-                                f"Processing glyph {processed_count}/{total_glyphs_in_strike}")
+        # The PNG offset is fixed per image format, which is set once per index subtable
+        png_offsets = {}
+        for index_subtable in strike.indexSubTables:
+            png_offset = CBDT_PNG_OFFSETS.get(getattr(index_subtable, 'imageFormat', None))
+            if png_offset is not None:
+                png_offsets.update(dict.fromkeys(index_subtable.names, png_offset))
 
+        probes = []
+        for glyph_name, bitmap_glyph in strike_data.items():
             try:
-                # Ensure the bitmap glyph is decompiled so we can access its data
-                if hasattr(bitmap_glyph, 'ensureDecompiled'):
-                    bitmap_glyph.ensureDecompiled()
-
                 # Get the bitmap data - before decompilation it's in 'data', after it's in 'imageData'
                 bitmap_data = None
-
-                # Try to get data before decompilation
-                if hasattr(bitmap_glyph, 'data') and bitmap_glyph.data:
-                    # Extract PNG data from the raw CBDT data
-                    raw_data = bitmap_glyph.data
-                    # Look for PNG signature in the data
-                    png_start = raw_data.find(b'\x89PNG')
-                    if png_start >= 0:
-                        bitmap_data = raw_data[png_start:]  # PNG data starts here
+                record_header = None
+
+                # Read raw data directly; attribute access would trigger decompilation
+                raw_data = bitmap_glyph.__dict__.get('data')
+                if raw_data:
+                    png_offset = png_offsets.get(glyph_name)
+                    if png_offset is not None and raw_data[png_offset:png_offset + 4] == PNG_SIGNATURE:
+                        # Slice the PNG out using the length field that precedes it
+                        (png_length,) = struct.unpack_from('>L', raw_data, png_offset - 4)
+                        bitmap_data = raw_data[png_offset:png_offset + png_length]
+                        record_header = raw_data[:png_offset - 4]
+                    else:
+                        # Unknown format - look for PNG signature in the data
+                        png_start = raw_data.find(PNG_SIGNATURE)
+                        if png_start >= 0:
+                            bitmap_data = raw_data[png_start:]  # PNG data starts here
 
                 # If no data found, try after decompilation
                 if not bitmap_data:
-                    if hasattr(bitmap_glyph, 'imageData') and bitmap_glyph.imageData:
-                        bitmap_data = bitmap_glyph.imageData
-
-                if bitmap_data and len(bitmap_data) > 10:  # Valid bitmap data
-                    # Resize the bitmap
-                    resized_data = resize_bitmap_data(bitmap_data, new_size)
-                    if resized_data:
-                        # Update the bitmap data back to the glyph
-                        # We need to update the imageData after decompilation
-                        bitmap_glyph.imageData = resized_data
+                    bitmap_data = getattr(bitmap_glyph, 'imageData', None)
 
-                        bitmaps_resized += 1
+                # Valid bitmap data has an IHDR chunk with non-zero dimensions
+                if bitmap_data and bitmap_data[12:16] == b'IHDR' and all(struct.unpack_from('>II', bitmap_data, 16)):
+                    probes.append((bitmap_glyph, bitmap_data, record_header))
 
             except Exception as e:
                 # Skip errors silently - most are expected (non-emoji glyphs)
                 continue
 
-        log(f"    Processed {total_glyphs} glyphs, successfully resized {bitmaps_resized} bitmaps")
-        return bitmaps_resized > 0
+        return probes
 
     except Exception as e:
         log(f"    ❌ Error accessing CBDT data: {e}")
+        return []
+
+
+def apply_resize(font, strike_index, probes, new_size, progress_callback=None, log=print,
+                 resize_cache=None):
+    """
+    Resize the bitmaps found by probe_strike and update the strike size
+
+    Identical bitmaps are resized only once. resize_cache maps (digest, new_size)
+    to resized PNG data and can be shared between calls to reuse work across strikes.
+    """
+    if resize_cache is None:
+        resize_cache = {}
+
+    strike = font["CBLC"].strikes[strike_index]
+
+    # Update the strike size information in CBLC
+    if hasattr(strike, 'bitmapSizeTable'):
+        bst = strike.bitmapSizeTable
+        if hasattr(bst, 'ppemX') and hasattr(bst, 'ppemY'):
+            bst.ppemX = new_size
+            bst.ppemY = new_size
+            log(f"    Updated CBLC strike size table to {new_size}x{new_size}")
+
+    bitmaps_resized = 0
+
+    try:
+        # Every glyph in a strike shares the same BitmapGlyph API, so resolve it once
+        ensure_decompiled = getattr(type(probes[0][0]), 'ensureDecompiled', None)
+
+        # Distinct bitmaps not already in the cache, keyed by content digest
+        pending = []
+        to_resize = {}
+        for bitmap_glyph, bitmap_data, record_header in probes:
+            cache_key = (hashlib.blake2b(bitmap_data, digest_size=16).digest(), new_size)
+            if cache_key not in resize_cache:
+                to_resize.setdefault(cache_key, bitmap_data)
+            pending.append((bitmap_glyph, cache_key, record_header))
+
+        # Resize each distinct bitmap once, across worker processes
+        total_pending = len(to_resize)
+        resized_iter = resize_bitmaps(list(to_resize.values()), new_size, log)
+        last_update = time.monotonic()
+        for processed_count, (cache_key, resized_data) in enumerate(zip(to_resize, resized_iter), 1):
+            # Report progress at most every PROGRESS_INTERVAL seconds, and always at the end
+            if progress_callback is not None:
+                now = time.monotonic()
+                if now - last_update >= PROGRESS_INTERVAL or processed_count == total_pending:
+                    last_update = now
+                    progress_callback(processed_count, total_pending,
+                                    f"Processing glyph {processed_count}/{total_pending}")
+
+            resize_cache[cache_key] = resized_data
+
+        # Write results back in this process, duplicates included
+        for bitmap_glyph, cache_key, record_header in pending:
+            resized_data = resize_cache[cache_key]
+            if not resized_data:
+                continue
+            # The glyph metrics have to follow the new image size
+            new_width, new_height = struct.unpack_from('>II', resized_data, 16)
+            if record_header is not None:
+                # Rebuild the raw record in place so CBDT compiles it without decompiling the glyph
+                record_header = scale_record_metrics(record_header, new_width, new_height)
+                bitmap_glyph.__class__ = _precompiled_glyph_class(type(bitmap_glyph))
+                bitmap_glyph.data = record_header + struct.pack('>L', len(resized_data)) + resized_data
+            else:
+                # Update the bitmap data back to the glyph
+                # We need to update the imageData after decompilation
+                if ensure_decompiled is not None:
+                    ensure_decompiled(bitmap_glyph)
+                bitmap_glyph.imageData = resized_data
+                metrics = getattr(bitmap_glyph, 'metrics', None)
+                if metrics is not None:
+                    scale_glyph_metrics(metrics, new_width, new_height)
+
+            bitmaps_resized += 1
+
+        log(f"    Processed {len(probes)} glyphs, successfully resized {bitmaps_resized} bitmaps")
+        return bitmaps_resized > 0
+
+    except Exception as e:
+        log(f"    ❌ Error resizing CBDT data: {e}")
         return False
 
 
+def scale_record_metrics(record_header, new_width, new_height):
+    """
+    Return a raw CBDT record header with its glyph metrics scaled to a new image size
+
+    Width and height become the new size; bearings and advances scale with them.
+    Headers without metrics (format 19) are returned unchanged.
+    """
+    metrics_struct = GLYPH_METRICS_STRUCTS.get(len(record_header))
+    if metrics_struct is None:
+        return record_header
+
+    values = metrics_struct.unpack(record_header)
+    height, width = values[0], values[1]
+    if (width, height) == (new_width, new_height) or not width or not height:
+        return record_header
+
+    scale_x = new_width / width
+    scale_y = new_height / height
+    if len(values) == 5:
+        _, _, bearing_x, bearing_y, advance = values
+        values = (new_height, new_width, _clamp_int8(bearing_x * scale_x),
+                  _clamp_int8(bearing_y * scale_y), _clamp_uint8(advance * scale_x))
+    else:
+        (_, _, hori_bearing_x, hori_bearing_y, hori_advance,
+         vert_bearing_x, vert_bearing_y, vert_advance) = values
+        values = (new_height, new_width,
+                  _clamp_int8(hori_bearing_x * scale_x), _clamp_int8(hori_bearing_y * scale_y),
+                  _clamp_uint8(hori_advance * scale_x),
+                  _clamp_int8(vert_bearing_x * scale_x), _clamp_int8(vert_bearing_y * scale_y),
+                  _clamp_uint8(vert_advance * scale_y))
+    return metrics_struct.pack(*values)
+
+
+def scale_glyph_metrics(metrics, new_width, new_height):
+    """
+    Scale a decompiled SmallGlyphMetrics or BigGlyphMetrics to a new image size
+    """
+    width, height = metrics.width, metrics.height
+    if (width, height) == (new_width, new_height) or not width or not height:
+        return
+
+    scale_x = new_width / width
+    scale_y = new_height / height
+    metrics.width = new_width
+    metrics.height = new_height
+    if hasattr(metrics, 'Advance'):
+        metrics.BearingX = _clamp_int8(metrics.BearingX * scale_x)
+        metrics.BearingY = _clamp_int8(metrics.BearingY * scale_y)
+        metrics.Advance = _clamp_uint8(metrics.Advance * scale_x)
+    else:
+        metrics.horiBearingX = _clamp_int8(metrics.horiBearingX * scale_x)
+        metrics.horiBearingY = _clamp_int8(metrics.horiBearingY * scale_y)
+        metrics.horiAdvance = _clamp_uint8(metrics.horiAdvance * scale_x)
+        metrics.vertBearingX = _clamp_int8(metrics.vertBearingX * scale_x)
+        metrics.vertBearingY = _clamp_int8(metrics.vertBearingY * scale_y)
+        metrics.vertAdvance = _clamp_uint8(metrics.vertAdvance * scale_y)
+
+
+def _clamp_int8(value):
+    """Round a scaled signed metric and keep it within int8"""
+    return max(-128, min(127, round(value)))
+
+
+def _clamp_uint8(value):
+    """Round a scaled unsigned metric and keep it within uint8"""
+    return max(0, min(255, round(value)))
+
+
+@lru_cache(maxsize=None)
+def _precompiled_glyph_class(glyph_class):
+    """
+    Subclass of a CBDT glyph format that compiles straight to its raw record
+
+    fontTools would otherwise decompile every glyph on save only to pack the same
+    metrics and image data again. The class name is kept because fontTools derives
+    the image format from it. Once decompiled (e.g. when something reads the
+    glyph's metrics), it compiles as usual.
+    """
+    if getattr(glyph_class, 'precompiled', False):
+        return glyph_class
+
+    def compile(self, ttFont):
+        data = self.__dict__.get('data')
+        if data is not None:
+            return data
+        return glyph_class.compile(self, ttFont)
+
+    return type(glyph_class.__name__, (glyph_class,), {'compile': compile, 'precompiled': True})
+
+
+def resize_bitmaps(bitmap_datas, new_size, log=print):
+    """
+    Resize a batch of bitmaps, spreading the work across CPU cores
+
+    Each bitmap is an independent bytes -> bytes transform. Small PNGs are cheaper
+    to resize than to pickle to another process, so they run on a thread pool
+    (Pillow releases the GIL while coding and resampling) and only the
+    large ones go to a process pool. The two pools share the CPU count between
+    them. Results are yielded in input order. Falls back to resizing in-process
+    when the batch is small.
+    """
+    workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(bitmap_datas) < PARALLEL_MIN_GLYPHS:
+        for bitmap_data in bitmap_datas:
+            yield resize_bitmap_data(bitmap_data, new_size)
+        return
+
+    threshold = ipc_threshold()
+    small = [bitmap_data for bitmap_data in bitmap_datas if len(bitmap_data) < threshold]
+    large = [bitmap_data for bitmap_data in bitmap_datas if len(bitmap_data) >= threshold]
+
+    # Split the cores rather than running a full pool of each kind
+    process_workers = max(1, workers // 2) if small else workers
+    thread_workers = max(1, workers - process_workers) if large else workers
+
+    with ThreadPoolExecutor(max_workers=thread_workers) as executor:
+        small_results = executor.map(partial(resize_bitmap_data, new_size=new_size), small)
+        large_results = _resize_in_processes(large, new_size, process_workers, log)
+        for bitmap_data in bitmap_datas:
+            yield next(small_results) if len(bitmap_data) < threshold else next(large_results)
+
+
+def ipc_threshold():
+    """
+    Return the PNG size in bytes from which bitmaps are resized in worker processes
+    """
+    try:
+        return int(os.environ.get('EMOJI_WIN_IPC_THRESHOLD', IPC_THRESHOLD))
+    except ValueError:
+        return IPC_THRESHOLD
+
+
+def _resize_in_processes(bitmap_datas, new_size, workers, log=print):
+    """
+    Resize bitmaps in fixed-size chunks mapped over a process pool
+
+    Results are yielded in input order. Falls back to resizing in-process when
+    there are too few bitmaps to pay for the pool or no pool can be started.
+
+    The pool is started while the resize thread pool is running, so it must
+    not fork this process: workers come from a forkserver (or are spawned
+    where that is unavailable) instead.
+    """
+    done = 0
+
+    if len(bitmap_datas) >= PARALLEL_MIN_GLYPHS:
+        batches = [bitmap_datas[start:start + PARALLEL_CHUNKSIZE]
+                   for start in range(0, len(bitmap_datas), PARALLEL_CHUNKSIZE)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_process_context()) as executor:
+                resize_batch = partial(resize_bitmap_batch, new_size=new_size)
+                for resized_batch in executor.map(resize_batch, batches):
+                    done += len(resized_batch)
+                    yield from resized_batch
+            return
+        except (OSError, BrokenProcessPool) as e:
+            log(f"    ⚠ Parallel resize unavailable ({e}), continuing on a single core")
+
+    for bitmap_data in bitmap_datas[done:]:
+        yield resize_bitmap_data(bitmap_data, new_size)
+
+
+def _process_context():
+    """
+    Return a multiprocessing context that never forks the calling process
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def resize_bitmap_batch(bitmap_datas, new_size):
+    """
+    Resize a list of same-strike bitmaps in a single call
+
+    This is the unit of work handed to pool workers, so a worker runs a tight
+    loop over the whole batch with one round trip instead of one per glyph.
+    """
+    resize = resize_bitmap_data
+    return [resize(bitmap_data, new_size) for bitmap_data in bitmap_datas]
+
+
 def update_strike_size_metadata(font, strike_index, new_size, log=print):
     """
     Update only the size metadata in CBLC table for DirectWrite compatibility
@@ -250,34 +565,47 @@ def resize_bitmap_data(bitmap_data, new_size):
         if len(bitmap_data) < 10:
             return None
 
+        # Read the size straight from the PNG IHDR chunk to skip decoding bitmaps that already fit
+        if bitmap_data[12:16] == b'IHDR' and struct.unpack_from('>II', bitmap_data, 16) == (new_size, new_size):
+            return bitmap_data  # No need to resize
+
         # Try to load the bitmap data as an image
-        image_stream = io.BytesIO(bitmap_data)
-        image = Image.open(image_stream)
+        image = Image.open(io.BytesIO(bitmap_data), formats=PIL_FORMATS)
 
         # Only resize if the size is actually different
         if image.size == (new_size, new_size):
             return bitmap_data  # No need to resize
 
+        # Convert to RGBA before resizing so palette images are resampled by colour,
+        # not by palette index, and transparency is always preserved
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+
         # Resize with high-quality resampling
-        resized_image = image.resize((new_size, new_size), Image.Resampling.LANCZOS)
+        resized_image = image.resize((new_size, new_size), LANCZOS)
 
         # Save back to bytes
-        output_stream = io.BytesIO()
-        # Use PNG format for DirectWrite compatibility
-        format_to_use = 'PNG'
+        output_stream = _get_encode_buffer()
 
-        # For PNG, preserve transparency
-        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
-            resized_image.save(output_stream, format=format_to_use, optimize=True)
-        else:
-            # Convert to RGBA to ensure transparency support
-            resized_image = resized_image.convert('RGBA')
-            resized_image.save(output_stream, format=format_to_use, optimize=True)
-
-        resized_data = output_stream.getvalue()
+        # zlib level 1 keeps most of the size win at a fraction of optimize=True's CPU cost
+        # Use PNG format for DirectWrite compatibility
+        resized_image.save(output_stream, format='PNG', compress_level=PNG_COMPRESS_LEVEL)
 
-        return resized_data
+        return output_stream.getvalue()
 
     except Exception as e:
         # Skip errors silently - return None for failed resizes
         return None
+
+
+def _get_encode_buffer():
+    """
+    Return this thread's encode buffer, emptied and rewound
+    """
+    buffer = getattr(_encode_buffers, 'buffer', None)
+    if buffer is None:
+        buffer = _encode_buffers.buffer = io.BytesIO()
+    buffer.seek(0)
+    buffer.truncate()
+    return buffer
+
@@ -13,25 +13,29 @@ import sys
 import os
 import argparse
 from pathlib import Path
-from fontTools.ttLib import TTFont
 
-try:
-    from rich.console import Console
-    from rich import print as rprint
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
-    rprint = print
+# Heavy dependencies (fontTools, Rich, the interactive UI) are imported by the
+# commands that need them, so `--help` and scripted runs start quickly
 
-from .font_converter import convert_apple_emoji_to_windows
-from .font_diagnostics import diagnose_cbdt_cblc_directwrite_issues, analyze_font_structure
 
-# Import interactive CLI if available
-try:
-    from .interactive_cli import InteractiveCLI
-    INTERACTIVE_AVAILABLE = True
-except ImportError:
-    INTERACTIVE_AVAILABLE = False
+def rprint(*objects, **kwargs):
+    """Print with Rich markup when Rich is installed, plain print otherwise"""
+    try:
+        from rich import print as rich_print
+    except ImportError:
+        rich_print = print
+    rich_print(*objects, **kwargs)
+
+
+def _load_interactive_cli():
+    """Import the interactive CLI on first use, or return None if its packages are missing"""
+    try:
+        from .interactive_cli import InteractiveCLI
+    except ImportError:
+        rprint("[red]❌ Interactive mode requires additional packages.[/red]")
+        rprint("[dim]Please run: uv sync[/dim]")
+        return None
+    return InteractiveCLI
 
 
 def main():
@@ -137,9 +141,8 @@ Get AppleColorEmoji.ttf from:
 
 def interactive_mode():
     """Enter interactive mode for command selection"""
-    if not INTERACTIVE_AVAILABLE:
-        rprint("[red]❌ Interactive mode requires additional packages.[/red]")
-        rprint("[dim]Please run: uv sync[/dim]")
+    InteractiveCLI = _load_interactive_cli()
+    if InteractiveCLI is None:
         return 1
 
     try:
@@ -182,9 +185,8 @@ def interactive_mode():
 
 def interactive_convert():
     """Interactive convert mode"""
-    if not INTERACTIVE_AVAILABLE:
-        rprint("[red]❌ Interactive mode requires additional packages.[/red]")
-        rprint("[dim]Please run: uv sync[/dim]")
+    InteractiveCLI = _load_interactive_cli()
+    if InteractiveCLI is None:
         return 1
 
     cli = InteractiveCLI()
@@ -193,9 +195,8 @@ def interactive_convert():
 
 def interactive_analyze():
     """Interactive analyze mode"""
-    if not INTERACTIVE_AVAILABLE:
-        rprint("[red]❌ Interactive mode requires additional packages.[/red]")
-        rprint("[dim]Please run: uv sync[/dim]")
+    InteractiveCLI = _load_interactive_cli()
+    if InteractiveCLI is None:
         return 1
 
     cli = InteractiveCLI()
@@ -204,9 +205,8 @@ def interactive_analyze():
 
 def interactive_diagnose():
     """Interactive diagnose mode"""
-    if not INTERACTIVE_AVAILABLE:
-        rprint("[red]❌ Interactive mode requires additional packages.[/red]")
-        rprint("[dim]Please run: uv sync[/dim]")
+    InteractiveCLI = _load_interactive_cli()
+    if InteractiveCLI is None:
         return 1
 
     cli = InteractiveCLI()
@@ -242,6 +242,7 @@ def convert_command(input_path, output_path):
     print("=" * 60)
     
     try:
+        from .font_converter import convert_apple_emoji_to_windows
         success = convert_apple_emoji_to_windows(str(input_file), str(output_file))
         if success:
             print("\n🎉 Conversion completed successfully!")
@@ -268,9 +269,15 @@ def diagnose_command(font_path):
     print("=" * 60)
     
     try:
-        font = TTFont(str(font_file))
-        diagnose_cbdt_cblc_directwrite_issues(font)
-        font.close()
+        from fontTools.ttLib import TTFont
+        from .font_diagnostics import diagnose_cbdt_cblc_directwrite_issues
+
+        # Tables are only decompiled when the report actually reads them
+        font = TTFont(str(font_file), lazy=True, recalcBBoxes=False, recalcTimestamp=False)
+        try:
+            diagnose_cbdt_cblc_directwrite_issues(font)
+        finally:
+            font.close()
         return 0
     except Exception as e:
         print(f"❌ Diagnostic failed with error: {e}")
@@ -291,9 +298,15 @@ def analyze_command(font_path):
     print("=" * 60)
     
     try:
-        font = TTFont(str(font_file))
-        analyze_font_structure(font)
-        font.close()
+        from fontTools.ttLib import TTFont
+        from .font_diagnostics import analyze_font_structure
+
+        # Tables are only decompiled when the report actually reads them
+        font = TTFont(str(font_file), lazy=True, recalcBBoxes=False, recalcTimestamp=False)
+        try:
+            analyze_font_structure(font)
+        finally:
+            font.close()
         return 0
     except Exception as e:
         print(f"❌ Analysis failed with error: {e}")
@@ -315,6 +328,7 @@ def legacy_main():
     input_path = sys.argv[1]
     output_path = sys.argv[2]
 
+    from .font_converter import convert_apple_emoji_to_windows
     success = convert_apple_emoji_to_windows(input_path, output_path)
     if not success:
         sys.exit(1)
@@ -9,31 +9,47 @@ Author: jjjuk
 License: MIT
 """
 
+import sys
+
+# Attributes worth reporting on CBLC strikes and index subtables; probing a fixed
+# list is far cheaper than dir() and doesn't depend on fontTools internals
+_PROBE_ATTRS = ('imageFormat', 'indexFormat', 'firstGlyphIndex', 'lastGlyphIndex',
+                'ppemX', 'ppemY', 'ppem', 'bitmapSizeTable', 'indexSubTables')
+_SIZE_ATTRS = ('ppemX', 'ppemY', 'ppem', 'bitmapSizeTable')
+
+# DirectWrite preferred strike sizes based on Windows Segoe UI Emoji
+_DW_PREFERRED_PPEM = frozenset((16, 20, 24, 32, 40, 48, 64, 96, 128))
+
 
 def diagnose_cbdt_cblc_directwrite_issues(font):
     """
     Diagnose specific CBDT/CBLC bitmap format issues that cause DirectWrite failures
     Based on Microsoft DirectWrite documentation and research
     """
-    print("\n=== CBDT/CBLC DIRECTWRITE DIAGNOSTIC ===")
+    # Each section is collected and written in one go rather than line by line
+    lines = []
+    out = lines.append
+
+    out("\n=== CBDT/CBLC DIRECTWRITE DIAGNOSTIC ===")
 
     if "CBDT" not in font or "CBLC" not in font:
-        print("⚠ No CBDT/CBLC tables found")
+        out("⚠ No CBDT/CBLC tables found")
+        _write_lines(lines)
         return
 
     cblc = font["CBLC"]
-    cbdt = font["CBDT"]
 
-    print(f"Found {len(cblc.strikes)} bitmap strikes")
+    out(f"Found {len(cblc.strikes)} bitmap strikes")
+    _write_lines(lines)
 
     # Critical DirectWrite requirements based on research:
     directwrite_issues = []
 
     for i, strike in enumerate(cblc.strikes):
-        print(f"\nStrike {i} analysis:")
+        out(f"\nStrike {i} analysis:")
 
         # 1. Deep analysis of strike attributes
-        print(f"  Strike attributes: {[attr for attr in dir(strike) if not attr.startswith('_')]}")
+        out(f"  Strike attributes: {_probe_attrs(strike)}")
 
         # Try multiple ways to get image format
         image_format = None
@@ -47,53 +63,28 @@ def diagnose_cbdt_cblc_directwrite_issues(font):
         # Method 2: Check indexSubTables for format info
         elif hasattr(strike, 'indexSubTables') and strike.indexSubTables:
             for j, subtable in enumerate(strike.indexSubTables):
-                print(f"    IndexSubTable {j} attributes: {[attr for attr in dir(subtable) if not attr.startswith('_')]}")
+                out(f"    IndexSubTable {j} attributes: {_probe_attrs(subtable)}")
                 if hasattr(subtable, 'imageFormat'):
                     image_format = subtable.imageFormat
                     format_found = True
-                    print(f"    Found imageFormat in indexSubTable {j}: {image_format}")
+                    out(f"    Found imageFormat in indexSubTable {j}: {image_format}")
                     break
 
-        # Method 3: Check first few bytes of actual bitmap data to identify format
-        if not format_found and hasattr(strike, 'indexSubTables') and strike.indexSubTables:
-            try:
-                # Try to access actual bitmap data
-                first_subtable = strike.indexSubTables[0]
-                if hasattr(first_subtable, 'firstGlyphIndex') and hasattr(first_subtable, 'lastGlyphIndex'):
-                    print(f"    Glyph range: {first_subtable.firstGlyphIndex}-{first_subtable.lastGlyphIndex}")
-
-                    # Try to get bitmap data from CBDT table
-                    if hasattr(cbdt, 'strikeData') and i < len(cbdt.strikeData):
-                        strike_data = cbdt.strikeData[i]
-                        if hasattr(strike_data, 'data') and len(strike_data.data) > 8:
-                            # Check magic bytes to identify format
-                            data_start = strike_data.data[:8]
-                            if data_start.startswith(b'\x89PNG'):
-                                image_format = 17
-                                format_found = True
-                                print(f"    Detected PNG format from bitmap data")
-                            elif data_start.startswith(b'\xFF\xD8\xFF'):
-                                image_format = 18
-                                format_found = True
-                                print(f"    Detected JPEG format from bitmap data")
-            except Exception as e:
-                print(f"    Could not analyze bitmap data: {e}")
-
         # Report image format findings
         if format_found and image_format is not None:
             format_names = {17: "PNG", 18: "JPEG", 19: "TIFF", 1: "Monochrome", 2: "Grayscale"}
             format_name = format_names.get(image_format, f"Unknown({image_format})")
-            print(f"  Image format: {format_name} (code: {image_format})")
+            out(f"  Image format: {format_name} (code: {image_format})")
 
             if image_format != 17:
                 issue = f"Strike {i}: DirectWrite prefers PNG format (17), found {image_format} ({format_name})"
                 directwrite_issues.append(issue)
-                print(f"  ❌ {issue}")
+                out(f"  ❌ {issue}")
             else:
-                print(f"  ✓ PNG format - DirectWrite compatible")
+                out(f"  ✓ PNG format - DirectWrite compatible")
         else:
             directwrite_issues.append(f"Strike {i}: Cannot determine image format - this is critical for DirectWrite")
-            print(f"  ❌ Cannot determine image format - this is critical for DirectWrite")
+            out(f"  ❌ Cannot determine image format - this is critical for DirectWrite")
 
         # 2. Deep analysis of strike sizes
         size_found = False
@@ -117,54 +108,56 @@ def diagnose_cbdt_cblc_directwrite_issues(font):
                 size_found = True
 
         if size_found:
-            print(f"  Size: {size_x}x{size_y} pixels")
+            out(f"  Size: {size_x}x{size_y} pixels")
 
-            # DirectWrite preferred sizes based on Windows Segoe UI Emoji
-            preferred_sizes = [16, 20, 24, 32, 40, 48, 64, 96, 128]
-            if size_x not in preferred_sizes or size_y not in preferred_sizes:
-                issue = f"Strike {i}: Unusual size {size_x}x{size_y} - DirectWrite prefers {preferred_sizes}"
+            if size_x not in _DW_PREFERRED_PPEM or size_y not in _DW_PREFERRED_PPEM:
+                issue = f"Strike {i}: Unusual size {size_x}x{size_y} - DirectWrite prefers {sorted(_DW_PREFERRED_PPEM)}"
                 directwrite_issues.append(issue)
-                print(f"  ⚠ {issue}")
+                out(f"  ⚠ {issue}")
             else:
-                print(f"  ✓ Standard size - DirectWrite compatible")
+                out(f"  ✓ Standard size - DirectWrite compatible")
         else:
-            print(f"  ⚠ Cannot determine strike size")
-            print(f"    Available strike attributes: {[attr for attr in dir(strike) if 'ppem' in attr.lower() or 'size' in attr.lower()]}")
+            out(f"  ⚠ Cannot determine strike size")
+            out(f"    Available strike attributes: { {attr: getattr(strike, attr, None) for attr in _SIZE_ATTRS} }")
 
         # 3. Check if strike has proper glyph metrics
         if hasattr(strike, 'indexSubTables') and strike.indexSubTables:
-            print(f"  Index subtables: {len(strike.indexSubTables)}")
-            print(f"  ✓ Has glyph index data")
+            out(f"  Index subtables: {len(strike.indexSubTables)}")
+            out(f"  ✓ Has glyph index data")
         else:
             issue = f"Strike {i}: Missing or empty index subtables"
             directwrite_issues.append(issue)
-            print(f"  ❌ {issue}")
+            out(f"  ❌ {issue}")
+
+        _write_lines(lines)
 
     # Summary of DirectWrite compatibility issues
-    print(f"\n=== DIRECTWRITE COMPATIBILITY SUMMARY ===")
+    out(f"\n=== DIRECTWRITE COMPATIBILITY SUMMARY ===")
     if directwrite_issues:
-        print(f"❌ Found {len(directwrite_issues)} potential DirectWrite issues:")
+        out(f"❌ Found {len(directwrite_issues)} potential DirectWrite issues:")
         for issue in directwrite_issues:
-            print(f"  • {issue}")
+            out(f"  • {issue}")
 
-        print(f"\n🎯 ROOT CAUSE ANALYSIS:")
-        print(f"DirectWrite shows empty spaces because:")
-        print(f"1. Font claims to support emoji characters (cmap table)")
-        print(f"2. DirectWrite finds CBDT/CBLC bitmap data")
-        print(f"3. DirectWrite validates bitmap format and fails")
-        print(f"4. Instead of fallback, DirectWrite shows empty space")
+        out(f"\n🎯 ROOT CAUSE ANALYSIS:")
+        out(f"DirectWrite shows empty spaces because:")
+        out(f"1. Font claims to support emoji characters (cmap table)")
+        out(f"2. DirectWrite finds CBDT/CBLC bitmap data")
+        out(f"3. DirectWrite validates bitmap format and fails")
+        out(f"4. Instead of fallback, DirectWrite shows empty space")
 
-        print(f"\n💡 POTENTIAL SOLUTIONS:")
+        out(f"\n💡 POTENTIAL SOLUTIONS:")
         if any("format" in issue.lower() for issue in directwrite_issues):
-            print(f"• Convert bitmap formats to PNG (format 17)")
+            out(f"• Convert bitmap formats to PNG (format 17)")
         if any("size" in issue.lower() for issue in directwrite_issues):
-            print(f"• Add standard DirectWrite bitmap sizes")
+            out(f"• Add standard DirectWrite bitmap sizes")
         if any("index" in issue.lower() for issue in directwrite_issues):
-            print(f"• Fix glyph index table structure")
+            out(f"• Fix glyph index table structure")
 
     else:
-        print(f"✓ No obvious CBDT/CBLC DirectWrite compatibility issues found")
-        print(f"  The issue may be in other font tables or DirectWrite validation")
+        out(f"✓ No obvious CBDT/CBLC DirectWrite compatibility issues found")
+        out(f"  The issue may be in other font tables or DirectWrite validation")
+
+    _write_lines(lines)
 
 
 def analyze_font_structure(font):
@@ -214,6 +207,17 @@ def analyze_font_structure(font):
         print(f"  Typography metrics: Ascender={os2.sTypoAscender}, Descender={os2.sTypoDescender}, LineGap={os2.sTypoLineGap}")
 
 
+def _write_lines(lines):
+    """Write collected report lines with a single call and reset the buffer"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    lines.clear()
+
+
+def _probe_attrs(obj):
+    """List which of the known interesting attributes an object has"""
+    return [attr for attr in _PROBE_ATTRS if getattr(obj, attr, None) is not None]
+
+
 def _get_platform_name(platform_id):
     """Get human-readable platform name"""
     platforms = {
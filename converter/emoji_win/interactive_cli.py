@@ -8,13 +8,15 @@ Author: jjjuk
 License: MIT
 """
 
+import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 try:
     from blessed import Terminal
-    from rich.console import Console
+    from rich.console import COLOR_SYSTEMS, Console, Group
     from rich.panel import Panel
     from rich.progress import (
         Progress,
@@ -26,8 +28,6 @@ try:
     from rich.table import Table
     from rich.text import Text
     from rich.prompt import Prompt, Confirm
-    from rich import print as rprint
-    from rich.tree import Tree
     from rich.live import Live
 
 except ImportError as e:
@@ -35,21 +35,139 @@ except ImportError as e:
     print("Please run: uv sync")
     sys.exit(1)
 
-from .font_converter import convert_apple_emoji_to_windows
-from .font_diagnostics import (
-    diagnose_cbdt_cblc_directwrite_issues,
-    analyze_font_structure,
-)
-from fontTools.ttLib import TTFont
-
 
 class InteractiveCLI:
     """Beautiful interactive CLI for emoji-win"""
 
+    _SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+    # Conversion steps shown in the progress panel, keyed by lowercase text for lookups
+    _MAJOR_STEPS = (
+        "Loading Apple emoji font",
+        "Ensuring Windows-compatible character mapping",
+        "Analyzing color table format",
+        "Checking essential font tables",
+        "Updating font names for compatibility",
+        "Updating OS/2 table for DirectWrite",
+        "Updating head table",
+        "Updating post table",
+        "Verifying essential font tables",
+        "Optimizing bitmap sizes for DirectWrite",
+        "Saving Windows-compatible font",
+    )
+    _MAJOR_STEP_MAP = {step.lower(): step for step in _MAJOR_STEPS}
+
+    # Selector key bindings: blessed key names first, then raw characters
+    _KEY_NAME_ACTIONS = {
+        "KEY_UP": "up",
+        "KEY_DOWN": "down",
+        "KEY_ENTER": "enter",
+        "KEY_ESCAPE": "cancel",
+    }
+    _KEY_CHAR_ACTIONS = {
+        "\r": "enter",
+        "\n": "enter",
+        "\x1b": "cancel",
+        "q": "cancel",
+        "Q": "cancel",
+    }
+
+    # Synchronized Output (DEC private mode 2026): the terminal holds the frame between
+    # these and paints it at once; terminals without support ignore the sequences
+    _SYNC_BEGIN = "\x1b[?2026h"
+    _SYNC_END = "\x1b[?2026l"
+
+    # Static part of the success panel, parsed from markup once
+    _INSTALL_FOOTER = Text.from_markup(
+        "[dim]To install on Windows:[/dim]\n"
+        "[dim]1. Copy the font file to your Windows machine[/dim]\n"
+        "[dim]2. Run windows_font_manager.bat as Administrator[/dim]\n"
+        "[dim]3. Choose option 1 (INSTALL)[/dim]\n"
+        "[dim]4. Restart Windows for changes to take effect[/dim]"
+    )
+
     def __init__(self):
         self.console = Console()
         self.term = Terminal()
         self.supported_extensions = [".ttf", ".otf"]  # Configurable for future
+        self._banner: Optional[Panel] = None
+
+        # Escape sequences used on every redraw or prompt, resolved once from the terminal
+        self._clear_eol: str = self.term.clear_eol
+        self._clear_eos: str = self.term.clear_eos
+        self._clear_prompt: str = self.term.move_up(1) + self._clear_eos
+
+    def _emit(self, *chunks: str) -> None:
+        """Write escape sequences and rendered output to the terminal in one write"""
+        sys.stdout.write("".join(chunks))
+        sys.stdout.flush()
+
+    @contextmanager
+    def _frame_buffered_stdout(self):
+        """
+        Turn off line buffering on stdout for the duration of the block.
+
+        Redraws then reach the terminal only at the explicit flush in _emit,
+        not whenever a newline is written.
+        """
+        stream = sys.stdout
+        line_buffering = getattr(stream, "line_buffering", None)
+        if line_buffering is None or not hasattr(stream, "reconfigure"):
+            # Replaced or non-text stdout; leave it alone
+            yield
+            return
+
+        stream.reconfigure(line_buffering=False)
+        try:
+            yield
+        finally:
+            stream.flush()
+            stream.reconfigure(line_buffering=line_buffering)
+
+    def _render_lines(self, renderable, options) -> List[str]:
+        """
+        Render to a list of ANSI-styled lines without going through console.capture().
+
+        Produces the same text console.print would write for the renderable, one
+        string per line and without the trailing newline.
+        """
+        color_system = COLOR_SYSTEMS.get(self.console.color_system)
+        legacy_windows = self.console.legacy_windows
+        return [
+            "".join(
+                style.render(text, color_system=color_system, legacy_windows=legacy_windows)
+                if style
+                else text
+                for text, style, _ in line
+            )
+            for line in self.console.render_lines(renderable, options, pad=False)
+        ]
+
+    def _redraw_changed_lines(self, old_lines: List[str], new_lines: List[str]) -> str:
+        """
+        Build the output that rewrites only the lines that differ between two renders.
+
+        Expects the cursor on the line just below the rendered block and leaves it there.
+
+        Args:
+            old_lines: Lines currently on screen
+            new_lines: Lines to show, same count as old_lines
+
+        Returns:
+            Escape sequences and line contents to write in one go
+        """
+        move_up, move_down, clear_eol = self.term.move_up, self.term.move_down, self._clear_eol
+        chunks: List[str] = []
+        row: int = len(old_lines)
+        for i, (old, new) in enumerate(zip(old_lines, new_lines)):
+            if old == new:
+                continue
+            chunks.append(move_up(row - i) if row > i else move_down(i - row))
+            chunks.append("\r" + new + clear_eol)
+            row = i
+        if row < len(old_lines):
+            chunks.append(move_down(len(old_lines) - row) + "\r")
+        return "".join(chunks)
 
     def _prompt_with_cleanup(self, prompt_text: str, default: str = "") -> str:
         """
@@ -70,7 +188,7 @@ class InteractiveCLI:
             result = Prompt.ask(prompt_text, default=default)
         else:
             result = Prompt.ask(prompt_text)
-        print(self.term.move_up(1) + self.term.clear_eos, end="", flush=True)
+        self._emit(self._clear_prompt)
         return result
 
     def _confirm_with_cleanup(self, prompt_text: str) -> bool:
@@ -86,28 +204,36 @@ class InteractiveCLI:
         # For now, just use regular Confirm.ask without cleanup
         # The cleanup was causing complexity, and prompts are short-lived
         result: bool = Confirm.ask(prompt_text)
-        print(self.term.move_up(1) + self.term.clear_eos, end="", flush=True)
+        self._emit(self._clear_prompt)
         return result
 
     def show_banner(self):
         """Display beautiful banner"""
-        banner = Panel.fit(
-            "[bold blue]🍎 emoji-win[/bold blue]\n"
-            "[dim]Get beautiful Apple emojis on Windows 11[/dim]\n"
-            "[dim]Convert Apple Color Emoji fonts for Windows compatibility[/dim]",
-            border_style="blue",
-            padding=(1, 2),
-        )
-        self.console.print(banner)
+        # The banner never changes, so build it on first use only
+        if self._banner is None:
+            self._banner = Panel.fit(
+                "[bold blue]🍎 emoji-win[/bold blue]\n"
+                "[dim]Get beautiful Apple emojis on Windows 11[/dim]\n"
+                "[dim]Convert Apple Color Emoji fonts for Windows compatibility[/dim]",
+                border_style="blue",
+                padding=(1, 2),
+            )
+        self.console.print(self._banner)
         self.console.print()
 
     def find_font_files(self, directory: Path) -> List[Path]:
         """Find supported font files in directory"""
-        font_files = []
-        if directory.exists():
-            for ext in self.supported_extensions:
-                font_files.extend(directory.glob(f"*{ext}"))
-        return sorted(font_files)
+        # One directory scan for all extensions instead of a glob per extension
+        extensions = tuple(self.supported_extensions)
+        try:
+            with os.scandir(directory) as entries:
+                return sorted(
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.name.lower().endswith(extensions) and entry.is_file()
+                )
+        except (FileNotFoundError, NotADirectoryError):
+            return []
 
     def select_input_font(self) -> Optional[Path]:
         """Interactive font selection with Textual table selector"""
@@ -118,12 +244,13 @@ class InteractiveCLI:
             Path("."),  # Current directory
         ]
 
-        all_fonts = []
+        # Key on the resolved path so the same file reached through different
+        # search paths (e.g. "." and "fonts" from the repo root) is listed once
+        found_fonts: Dict[str, Path] = {}
         for search_path in search_paths:
-            fonts = self.find_font_files(search_path)
-            for font in fonts:
-                if font not in all_fonts:
-                    all_fonts.append(font)
+            for font in self.find_font_files(search_path):
+                found_fonts.setdefault(str(font.resolve()), font)
+        all_fonts = list(found_fonts.values())
 
         if not all_fonts:
             self.console.print("[red]❌ No font files found in common locations[/red]")
@@ -184,19 +311,31 @@ class InteractiveCLI:
 
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human readable format"""
-        for unit in ["B", "KB", "MB", "GB"]:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
+        # Each unit is 2**10 of the previous one, so the bit length picks the unit directly
+        unit_index = min(len(self._SIZE_UNITS) - 1, max(0, (size_bytes.bit_length() - 1) // 10))
+        return f"{size_bytes / (1 << (10 * unit_index)):.1f} {self._SIZE_UNITS[unit_index]}"
 
     def _interactive_table_selector(self, fonts: list[Path]) -> Optional[Path]:
         """Interactive font selector with arrow key navigation using blessed and Rich table"""
-        selected_index = 0
+        selected_index: int = 0
 
         # Add custom path option to fonts list
         all_options = fonts + [None]  # None represents custom path option
 
+        # File details don't change while the selector is open, so stat each font once
+        rows: List[Tuple[str, str, str, Optional[str]]] = []
+        for font_path in all_options:
+            if font_path is None:  # Custom path option
+                rows.append(("[italic]Enter custom path...[/italic]", "", "", "dim white"))
+                continue
+            try:
+                size = self._format_file_size(font_path.stat().st_size)
+            except OSError:
+                size = "[dim]Unknown[/dim]"
+            rows.append((font_path.name, str(font_path.parent), size, None))
+
+        selected_style = "bold white on blue"
+
         def file_selector_table():
             """Create Rich table with current selection highlighted"""
             table = Table(
@@ -209,90 +348,88 @@ class InteractiveCLI:
             table.add_column("Location", style="dim white", min_width=12)
             table.add_column("Size", style="bright_green", justify="right", min_width=8)
 
-            for i, font_path in enumerate(all_options):
-                row_style = None
-
-                if font_path is None:  # Custom path option
-                    name = "[italic]Enter custom path...[/italic]"
-                    row_style = "dim white"
-                    location = ""
-                    size = ""
-                else:
-                    try:
-                        size_bytes = font_path.stat().st_size
-                        size = self._format_file_size(size_bytes)
-                        location = str(font_path.parent)
-                        name = font_path.name
-                    except OSError:
-                        name = font_path.name
-                        location = str(font_path.parent)
-                        size = "[dim]Unknown[/dim]"
-
+            for i, (name, location, size, row_style) in enumerate(rows):
                 # Highlight selected row with blue background
                 if i == selected_index:
-                    row_style = "bold white on blue"
+                    row_style = selected_style
 
                 table.add_row(name, location, size, style=row_style)
 
             return table
 
         # Main interaction loop using position anchored to current program start
-        with self.term.cbreak(), self.term.hidden_cursor():
+        with self.term.cbreak(), self.term.hidden_cursor(), self._frame_buffered_stdout():
             # init table height
             table_height: int
 
-            # Capture and print initial table
-            with self.console.capture() as capture:
-                self.console.print(file_selector_table())
-            table_output = capture.get()
+            # Build the table once; moving the selection only restyles two rows
+            table = file_selector_table()
+
+            # Render options only change with the terminal size
+            options = self.console.options
 
-            # save table height
-            table_height = len(table_output.splitlines())
-            print(table_output, end="", flush=True)
+            # Keep the rendered lines so later redraws only rewrite rows that changed
+            prev_lines: List[str] = self._render_lines(table, options)
+            table_output = "\n".join(prev_lines) + "\n"
+            table_height = len(prev_lines)
+            table_width: int = self.term.width
+            # Sequence that wipes the table on exit; only changes if the table height does
+            clear_table = self.term.move_up(table_height + 1) + self._clear_eos
+            self._emit(table_output)
 
             while True:
-                key = self.term.inkey(timeout=0.1)
-                if not key:
-                    continue
+                # Block until a key arrives; nothing on screen changes in between
+                key = self.term.inkey()
 
+                action = self._KEY_NAME_ACTIONS.get(key.name) or self._KEY_CHAR_ACTIONS.get(str(key))
                 old_index = selected_index
 
-                if key.name == "KEY_UP":
+                if action == "up":
                     selected_index = max(0, selected_index - 1)
 
-                elif key.name == "KEY_DOWN":
+                elif action == "down":
                     selected_index = min(len(all_options) - 1, selected_index + 1)
 
                 # Only redraw if selection changed - go to exact position relative to program start
                 if selected_index != old_index:
-                    # Move to table start position (program start + offset for empty line)
-                    print(
-                        self.term.move_up(table_height),
-                        end="",
-                        flush=True,
-                    )
+                    table.rows[old_index].style = rows[old_index][3]
+                    table.rows[selected_index].style = selected_style
+
+                    resized = self.term.width != table_width
+                    if resized:
+                        options = self.console.options
 
                     # Redraw table
-                    with self.console.capture() as capture:
-                        self.console.print(file_selector_table())
-                    table_output = capture.get()
-                    print(table_output, end="", flush=True)
+                    new_lines = self._render_lines(table, options)
+
+                    if resized or len(new_lines) != table_height:
+                        # Terminal was resized and rows no longer line up - redraw the whole table
+                        self._emit(
+                            self._SYNC_BEGIN,
+                            self.term.move_up(table_height),
+                            self._clear_eos,
+                            "\n".join(new_lines) + "\n",
+                            self._SYNC_END,
+                        )
+                        table_height = len(new_lines)
+                        table_width = self.term.width
+                        clear_table = self.term.move_up(table_height + 1) + self._clear_eos
+                    else:
+                        # Only the previously and newly selected rows differ
+                        self._emit(
+                            self._SYNC_BEGIN,
+                            self._redraw_changed_lines(prev_lines, new_lines),
+                            self._SYNC_END,
+                        )
+                    prev_lines = new_lines
 
-                elif key.name == "KEY_ENTER" or key == "\r" or key == "\n":
+                elif action == "enter":
                     # Clear table before exiting
-                    print(
-                        self.term.move_up(table_height + 1) + self.term.clear_eos,
-                        end="",
-                        flush=True,
-                    )
+                    self._emit(clear_table)
                     break
-                elif key.name == "KEY_ESCAPE" or key == "\x1b":
-                    # Move cursor below table before exiting
-                    print()
-                    return None
-                elif key == "q" or key == "Q":
+                elif action == "cancel":
                     # Move cursor below table before exiting
-                    print()
+                    self._emit("\n")
                     return None
 
         # Handle selection
@@ -314,10 +451,13 @@ class InteractiveCLI:
 
     def convert_with_progress(self, input_path: Path, output_path: Path) -> bool:
         """Convert font with beautiful progress display"""
+        # Imported here so the menu and file picker come up without loading fontTools/Pillow
+        from .font_converter import convert_apple_emoji_to_windows
 
         # Track completed steps for display inside the panel
         completed_steps = []
         current_step = ""
+        last_description = None
 
         # Create initial panel content
         def create_panel_content():
@@ -332,11 +472,15 @@ class InteractiveCLI:
             return content
 
         # Create live updating panel
+        # One panel for the whole conversion; updates only swap its content
         panel = Panel(
             create_panel_content(), title="🔄 Font Conversion", border_style="blue"
         )
 
-        with Live(panel, console=self.console, refresh_per_second=4) as live:
+        # Only the outermost Live runs a refresh thread; the nested Progress below is
+        # repainted by it, so it must auto-refresh for the bar and spinner to move.
+        # Step changes still redraw immediately through live.update(..., refresh=True).
+        with Live(panel, console=self.console, refresh_per_second=10) as live:
 
             # Create progress display
             with Progress(
@@ -346,6 +490,8 @@ class InteractiveCLI:
                 TaskProgressColumn(),
                 console=self.console,
                 transient=True,  # Progress bar disappears after completion
+                refresh_per_second=10,
+                redirect_stdout=False,
             ) as progress:
 
                 # Add main conversion task
@@ -353,42 +499,31 @@ class InteractiveCLI:
 
                 def progress_callback(step, total, description):
                     """Update progress bar with real conversion progress and show persistent steps"""
-                    nonlocal current_step, completed_steps
-
-                    # Check if we've moved to a new major step
-                    major_steps = [
-                        "Loading Apple emoji font",
-                        "Ensuring Windows-compatible character mapping",
-                        "Analyzing color table format",
-                        "Checking essential font tables",
-                        "Updating font names for compatibility",
-                        "Updating OS/2 table for DirectWrite",
-                        "Updating head table",
-                        "Updating post table",
-                        "Verifying essential font tables",
-                        "Optimizing bitmap sizes for DirectWrite",
-                        "Saving Windows-compatible font",
-                    ]
-
-                    # Find which major step we're in
-                    for major_step in major_steps:
-                        if major_step.lower() in description.lower():
-                            if major_step != current_step:
-                                # Mark previous step as complete
-                                if current_step and current_step not in completed_steps:
-                                    completed_steps.append(current_step)
-
-                                current_step = major_step
-
-                                # Update the live panel
-                                live.update(
-                                    Panel(
-                                        create_panel_content(),
-                                        title="🔄 Font Conversion",
-                                        border_style="blue",
-                                    )
-                                )
-                            break
+                    nonlocal current_step, completed_steps, last_description
+
+                    # Check if we've moved to a new major step (repeated descriptions can't be one)
+                    if description != last_description:
+                        last_description = description
+                        description_lower = description.lower()
+
+                        # Step descriptions are the step name plus "...", so try an exact lookup first
+                        major_step = self._MAJOR_STEP_MAP.get(description_lower.rstrip("."))
+                        if major_step is None:
+                            major_step = next(
+                                (step for key, step in self._MAJOR_STEP_MAP.items() if key in description_lower),
+                                None,
+                            )
+
+                        if major_step is not None and major_step != current_step:
+                            # Mark previous step as complete
+                            if current_step and current_step not in completed_steps:
+                                completed_steps.append(current_step)
+
+                            current_step = major_step
+
+                            # Update the live panel
+                            panel.renderable = create_panel_content()
+                            live.update(panel, refresh=True)
 
                     # Update progress bar
                     progress.update(
@@ -420,21 +555,14 @@ class InteractiveCLI:
                         final_content += (
                             f"\n[bold green]✨ Font successfully converted![/bold green]\n\n"
                             f"[bold]Output file:[/bold] {output_path}\n"
-                            f"[bold]File size:[/bold] {self._format_file_size(output_path.stat().st_size)}\n\n"
-                            f"[dim]To install on Windows:[/dim]\n"
-                            f"[dim]1. Copy the font file to your Windows machine[/dim]\n"
-                            f"[dim]2. Run windows_font_manager.bat as Administrator[/dim]\n"
-                            f"[dim]3. Choose option 1 (INSTALL)[/dim]\n"
-                            f"[dim]4. Restart Windows for changes to take effect[/dim]"
+                            f"[bold]File size:[/bold] {self._format_file_size(output_path.stat().st_size)}\n"
                         )
 
-                        live.update(
-                            Panel(
-                                final_content,
-                                title="🎉 Success",
-                                border_style="green",
-                            )
-                        )
+                        # Group puts the footer on its own line, so only one newline above
+                        panel.renderable = Group(final_content, self._INSTALL_FOOTER)
+                        panel.title = "🎉 Success"
+                        panel.border_style = "green"
+                        live.update(panel, refresh=True)
 
                         progress.update(
                             convert_task,
@@ -442,12 +570,8 @@ class InteractiveCLI:
                             description="[green]✓[/green] Conversion complete!",
                         )
 
-                        # Wait a moment to show completion
-                        import time
-
-                        time.sleep(1)
-
-                        # Exit live context to finalize the panel
+                        # Success panel was already drawn by the refresh above; exiting the
+                        # live context leaves it on screen, so no pause is needed
 
                     else:
                         progress.update(
@@ -507,6 +631,9 @@ class InteractiveCLI:
             task = progress.add_task("Analyzing font...", total=None)
 
             try:
+                from fontTools.ttLib import TTFont
+                from .font_diagnostics import analyze_font_structure
+
                 font = TTFont(str(input_path))
                 analyze_font_structure(font)
                 font.close()
@@ -539,6 +666,9 @@ class InteractiveCLI:
             task = progress.add_task("Diagnosing font...", total=None)
 
             try:
+                from fontTools.ttLib import TTFont
+                from .font_diagnostics import diagnose_cbdt_cblc_directwrite_issues
+
                 font = TTFont(str(input_path))
                 diagnose_cbdt_cblc_directwrite_issues(font)
                 font.close()
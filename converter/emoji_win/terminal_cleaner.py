@@ -9,7 +9,7 @@ License: MIT
 """
 
 from blessed import Terminal
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
 
 
 class TerminalCleaner:
@@ -50,6 +50,8 @@ class TerminalCleaner:
         self.term = terminal
         self.saved_y: Optional[int] = None
         self.saved_x: Optional[int] = None
+        # (y, x, move_yx sequence) for the last position cleared back to
+        self._saved_move: Optional[Tuple[int, int, str]] = None
     
     def save_position(self) -> None:
         """
@@ -80,15 +82,20 @@ class TerminalCleaner:
             return
 
         try:
+            position = (self.saved_y, self.saved_x)
+            if self._saved_move is None or self._saved_move[:2] != position:
+                self._saved_move = position + (str(self.term.move_yx(*position)),)
+            move = self._saved_move[2]
+            
             # Move to saved position
-            print(self.term.move_yx(self.saved_y, self.saved_x), end='')
+            print(move, end='')
 
             # Clear from saved position to end of screen
             # This is more reliable than trying to calculate exact lines
             print(self.term.clear_eos, end='')
 
             # Return to saved position
-            print(self.term.move_yx(self.saved_y, self.saved_x), end='')
+            print(move, end='')
 
         except Exception:
             # Fallback: try to clear screen if positioning fails
@@ -119,6 +126,7 @@ class TerminalCleaner:
         """
         self.saved_y = None
         self.saved_x = None
+        self._saved_move = None
     
     def is_position_saved(self) -> bool:
         """
@@ -9,9 +9,9 @@ License: MIT
 """
 
 from blessed import Terminal
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 import sys
-from io import StringIO
+import time
 
 
 class TerminalCleanerV2:
@@ -38,8 +38,18 @@ class TerminalCleanerV2:
             print("New content")
         
         cleaner.clear_and_redraw(draw_content)
+        
+        # Restore the original stdout when done
+        cleaner.uninstall()
     """
     
+    __slots__ = (
+        'term', 'lines_printed', 'is_tracking', 'original_stdout', '_wrapper',
+        '_last_frame', '_last_frame_lines', 'min_redraw_interval',
+        '_last_redraw_monotonic', '_pending_draw', '_move_up_s', '_clear_eol_s',
+        '_clear_eos_s', '_ansi', '_counted_up', '_clear_sequence',
+    )
+    
     def __init__(self, terminal: Terminal):
         """
         Initialize TerminalCleanerV2 with a blessed Terminal instance.
@@ -51,32 +61,102 @@ class TerminalCleanerV2:
         self.lines_printed = 0
         self.is_tracking = False
         self.original_stdout = None
-        self.captured_output = None
+        self._wrapper = None
+        
+        # Last frame drawn by clear_and_redraw and its lines, used to diff the
+        # next frame against (the last entry is the unterminated tail)
+        self._last_frame = None
+        self._last_frame_lines = []
+        
+        # Redraws closer together than this (in seconds) are skipped; the
+        # latest skipped one is kept so flush_redraw() can draw it. Set to
+        # e.g. 1 / 30 to cap tight redraw loops at ~30 frames per second
+        self.min_redraw_interval = 0.0
+        self._last_redraw_monotonic = 0.0
+        self._pending_draw = None
+        
+        # Capability strings, resolved on first clear
+        self._move_up_s = None
+        self._clear_eol_s = None
+        self._clear_eos_s = ''
+        self._ansi = False
+        self._counted_up = False
+        # Builder for the clear sequence, picked for the terminal on first use
+        self._clear_sequence = None
+    
+    def refresh_capabilities(self) -> None:
+        """
+        Re-resolve the cached terminal capability strings.
+        
+        Call this if the terminal's capabilities change (e.g. TERM is switched)
+        while the cleaner is alive.
+        """
+        self._move_up_s, self._clear_eol_s = (
+            str(self.term.move_up), str(self.term.clear_eol)
+        )
+        self._clear_eos_s = str(getattr(self.term, 'clear_eos', ''))
+        # ANSI terminals take counted cursor moves (ESC[nA) in one sequence
+        self._ansi = self._clear_eos_s.startswith('\x1b[')
+        self._counted_up = self._ansi or self._move_up_s.startswith('\x1b[')
+        self._clear_sequence = (
+            self._ansi_clear_sequence if self._ansi else self._per_line_clear_sequence
+        )
+    
+    def _ansi_clear_sequence(self, count: int) -> str:
+        """Clear sequence using one counted move and one clear to end of screen."""
+        return '\r' + self._move_up_by(count) + self._clear_eos_s
+    
+    def _per_line_clear_sequence(self, count: int) -> str:
+        """Clear sequence that moves up and clears one line at a time."""
+        clear_eol = self._clear_eol_s
+        return '\r' + clear_eol + (self._move_up_s + clear_eol) * count
+    
+    def _move_up_by(self, count: int) -> str:
+        """
+        Return the sequence that moves the cursor up by count lines.
+        
+        Args:
+            count: Number of lines to move up
+            
+        Returns:
+            A single counted escape on ANSI terminals, repeated move_up otherwise
+        """
+        if count <= 0:
+            return ''
+        if self._counted_up:
+            return f'\x1b[{count}A'
+        return self._move_up_s * count
     
     def start_tracking(self) -> None:
         """
         Start tracking printed lines.
         
         This method begins counting how many lines are printed to stdout.
+        The counting wrapper is installed on first use and kept in place
+        across stop/start cycles until uninstall() or reset() is called.
         """
         self.lines_printed = 0
         self.is_tracking = True
+        self._last_frame = None
+        self._last_frame_lines = []
         
-        # Capture stdout to count lines
-        self.original_stdout = sys.stdout
-        self.captured_output = StringIO()
-        sys.stdout = LineCountingWrapper(self.original_stdout, self)
+        # Capture stdout to count lines, unless our wrapper is still installed
+        if sys.stdout is not self._wrapper or self._wrapper is None:
+            self.original_stdout = sys.stdout
+            self._wrapper = LineCountingWrapper(self.original_stdout, self)
+            sys.stdout = self._wrapper
     
     def stop_tracking(self) -> None:
         """
         Stop tracking printed lines.
         
-        This restores normal stdout behavior.
+        This does not restore sys.stdout: the wrapper stays installed and
+        passes writes straight through, so the next start_tracking() doesn't
+        have to swap it again. Callers must call uninstall() (or reset())
+        when they are done with the cleaner, e.g. on exit.
         """
-        if self.original_stdout:
-            sys.stdout = self.original_stdout
-            self.original_stdout = None
-        self.captured_output = None
+        self._last_frame = None
+        self._last_frame_lines = []
         self.is_tracking = False
     
     def add_lines(self, count: int) -> None:
@@ -93,54 +173,148 @@ class TerminalCleanerV2:
         """
         Clear all tracked lines.
         
-        This method moves the cursor up by the number of tracked lines
-        and clears each line.
+        This method moves the cursor up by the number of tracked lines,
+        clearing each line on the way, and leaves it at the start of the
+        first tracked line.
         """
         if not self.is_tracking or self.lines_printed == 0:
             return
         
+        self._last_frame = None
+        self._last_frame_lines = []
+        if self._clear_sequence is None:
+            self.refresh_capabilities()
+        
+        # The cursor sits on the line below the tracked output: clear it,
+        # then walk up once over the tracked lines, clearing each
+        buf = self._clear_sequence(self.lines_printed)
+        
         try:
-            # Stop tracking during clear to avoid counting clear operations
-            was_tracking = self.is_tracking
-            self.stop_tracking()
-            
-            # Move up and clear each line
-            for i in range(self.lines_printed):
-                if i > 0:  # Don't move up on first iteration (we're already on the last line)
-                    print(self.term.move_up, end='', flush=True)
-                print(self.term.clear_eol, end='', flush=True)
-            
-            # Move up to the first line position
-            if self.lines_printed > 0:
-                for _ in range(self.lines_printed - 1):
-                    print(self.term.move_up, end='', flush=True)
-            
-            # Reset line count
-            self.lines_printed = 0
-            
-            # Resume tracking if it was active
-            if was_tracking:
-                self.start_tracking()
-                
-        except Exception:
+            # Write straight to the real stdout so the clear isn't counted
+            self.original_stdout.write(buf)
+            self.original_stdout.flush()
+        except OSError:
             # Fallback: clear screen if positioning fails
             print(self.term.clear, end='', flush=True)
-            self.lines_printed = 0
+        
+        # Reset line count
+        self.lines_printed = 0
     
-    def clear_and_redraw(self, draw_function: Callable[[], None]) -> None:
+    def clear_and_redraw(self, draw_function: Callable[[], None],
+                         force: bool = False) -> None:
         """
         Clear tracked content and redraw using provided function.
         
+        Calls arriving less than ``min_redraw_interval`` after the previous
+        redraw are skipped unless ``force`` is set; call flush_redraw() after
+        a burst to make sure the last skipped frame is drawn.
+        
         This method:
-        1. Clears all tracked lines
-        2. Calls the draw function to redraw content
+        1. Captures the output of the draw function
+        2. If the previous frame is still on screen with the same number of
+           lines, rewrites only the lines that changed; otherwise clears all
+           tracked lines and writes the new frame
         3. Continues tracking the new content
         
         Args:
             draw_function: A callable that draws the new content
+            force: Redraw even if the previous redraw was too recent
+        """
+        now = time.monotonic()
+        if not force and now - self._last_redraw_monotonic < self.min_redraw_interval:
+            self._pending_draw = draw_function
+            return
+        self._last_redraw_monotonic = now
+        self._pending_draw = None
+        
+        wrapper = self._wrapper
+        if not self.is_tracking or wrapper is None:
+            self.clear_tracked()
+            draw_function()
+            return
+        
+        chunks = []
+        wrapper.capture = chunks
+        try:
+            draw_function()
+        finally:
+            wrapper.capture = None
+        frame = ''.join(chunks)
+        old_lines = self._last_frame_lines
+        
+        # Identical frame still on screen: nothing to write
+        if frame == self._last_frame and self.lines_printed == len(old_lines) - 1:
+            return
+        new_lines = frame.split('\n')
+        
+        # Only diff if nothing else was printed since the last frame
+        if (len(new_lines) == len(old_lines)
+                and self.lines_printed == len(old_lines) - 1):
+            buf = self._diff_frame(old_lines, new_lines)
+        else:
+            self.clear_tracked()
+            buf = frame
+        
+        try:
+            if buf:
+                self.original_stdout.write(buf)
+                self.original_stdout.flush()
+        except OSError:
+            # Fallback: clear screen and draw the whole frame
+            print(self.term.clear, end='', flush=True)
+            self.original_stdout.write(frame)
+            self.original_stdout.flush()
+        
+        self.lines_printed = len(new_lines) - 1
+        self._last_frame = frame
+        self._last_frame_lines = new_lines
+    
+    def flush_redraw(self) -> None:
+        """
+        Draw the most recent redraw skipped by throttling, if any.
+        """
+        if self._pending_draw is not None:
+            self.clear_and_redraw(self._pending_draw, force=True)
+    
+    def _diff_frame(self, old_lines: List[str], new_lines: List[str]) -> str:
+        """
+        Build the output that turns the old frame into the new one.
+        
+        The cursor is assumed to sit at the end of the old frame's last line.
+        Changed lines are rewritten top to bottom, and the cursor is left at
+        the end of the new frame.
+        
+        Args:
+            old_lines: Lines of the frame currently on screen
+            new_lines: Lines of the new frame (same count as old_lines)
+            
+        Returns:
+            Escape sequences and text to write, or '' if nothing changed
         """
-        self.clear_tracked()
-        draw_function()
+        changed = [i for i, (old_line, new_line) in enumerate(zip(old_lines, new_lines))
+                   if old_line != new_line]
+        if not changed:
+            return ''
+        
+        if self._clear_sequence is None:
+            self.refresh_capabilities()
+        clear_eol = self._clear_eol_s
+        
+        last = len(new_lines) - 1
+        row = last
+        parts = []
+        for i in changed:
+            if i < row:
+                parts.append(self._move_up_by(row - i))
+            elif i > row:
+                parts.append('\n' * (i - row))
+            parts.append('\r' + clear_eol + new_lines[i])
+            row = i
+        
+        if row < last:
+            # Back down to the tail line, restoring its (unchanged) text
+            parts.append('\n' * (last - row) + new_lines[last])
+        return ''.join(parts)
     
     def get_line_count(self) -> int:
         """
@@ -151,24 +325,63 @@ class TerminalCleanerV2:
         """
         return self.lines_printed
     
+    def uninstall(self) -> None:
+        """
+        Stop tracking and restore the original stdout.
+        
+        Safe to call more than once. If something else replaced sys.stdout
+        after the wrapper was installed, it is left alone.
+        """
+        self.stop_tracking()
+        if self._wrapper is not None and sys.stdout is self._wrapper:
+            sys.stdout = self.original_stdout
+        self.original_stdout = None
+        self._wrapper = None
+    
     def reset(self) -> None:
         """
         Reset the cleaner to initial state.
         
-        This stops tracking and resets the line count.
+        This stops tracking, restores the original stdout, resets the line
+        count and drops the cached terminal capabilities so they are
+        re-resolved on the next clear.
         """
-        self.stop_tracking()
+        self.uninstall()
         self.lines_printed = 0
+        self._clear_sequence = None
 
 
 class LineCountingWrapper:
     """Wrapper for stdout that counts lines printed"""
     
+    # Stream attributes bound directly on the instance so lookups don't go
+    # through __getattr__; ``closed``, ``encoding`` and ``errors`` stay
+    # dynamic since they change (the latter two via reconfigure())
+    _FORWARDED_ATTRS = (
+        'isatty', 'fileno', 'buffer', 'writable',
+        'readable', 'seekable', 'close', 'mode', 'name',
+    )
+    
+    __slots__ = ('original_stdout', 'cleaner', 'capture', '_write') + _FORWARDED_ATTRS
+    
     def __init__(self, original_stdout, cleaner):
         self.original_stdout = original_stdout
         self.cleaner = cleaner
+        # When set to a list, writes are collected there instead of output
+        self.capture = None
+        # Bound once; write() is called for every print while tracking
+        self._write = original_stdout.write
+        for name in self._FORWARDED_ATTRS:
+            try:
+                setattr(self, name, getattr(original_stdout, name))
+            except AttributeError:
+                pass
     
     def write(self, text):
+        if self.capture is not None:
+            self.capture.append(text)
+            return len(text)
+        
         # Count newlines in the text
         if text and self.cleaner.is_tracking:
             newline_count = text.count('\n')
@@ -176,10 +389,23 @@ class LineCountingWrapper:
                 self.cleaner.lines_printed += newline_count
         
         # Write to original stdout
-        return self.original_stdout.write(text)
+        return self._write(text)
+    
+    def writelines(self, lines):
+        # One counted write instead of falling through to the original
+        # stream's writelines, which would bypass counting and capture
+        self.write(''.join(lines))
     
     def flush(self):
         return self.original_stdout.flush()
     
+    @property
+    def encoding(self):
+        return self.original_stdout.encoding
+    
+    @property
+    def errors(self):
+        return self.original_stdout.errors
+    
     def __getattr__(self, name):
         return getattr(self.original_stdout, name)
@@ -0,0 +1,213 @@
+"""
+Tests for the CBDT/CBLC bitmap resize path
+
+This module round-trips a small synthetic CBDT/CBLC font through the resize
+path and checks the reloaded output.
+"""
+
+import io
+import os
+import struct
+import pytest
+from unittest.mock import patch
+from PIL import Image
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont, newTable
+from fontTools.ttLib.tables.C_B_D_T_ import cbdt_bitmap_format_17
+from fontTools.ttLib.tables.E_B_L_C_ import (
+    BitmapSizeTable, SbitLineMetrics, Strike, eblc_index_sub_table_1
+)
+
+from emoji_win.bitmap_processor import (
+    PARALLEL_MIN_GLYPHS, fix_cbdt_cblc_sizes_for_directwrite, scale_record_metrics
+)
+
+
+# More distinct bitmaps than PARALLEL_MIN_GLYPHS, so the pools are used
+DISTINCT_BITMAPS = PARALLEL_MIN_GLYPHS + 44
+# Extra glyphs that reuse the first bitmaps
+DUPLICATE_BITMAPS = 20
+
+LINE_METRICS_FIELDS = (
+    'ascender', 'descender', 'widthMax', 'caretSlopeNumerator', 'caretSlopeDenominator',
+    'caretOffset', 'minOriginSB', 'minAdvanceSB', 'maxBeforeBL', 'minAfterBL', 'pad1', 'pad2'
+)
+
+
+def _png(size, color):
+    """Encode a solid size x size RGBA PNG"""
+    buffer = io.BytesIO()
+    Image.new('RGBA', (size, size), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _build_cbdt_font(strike_sizes):
+    """
+    Build a font with one format 17 CBDT strike per size and return it as bytes
+
+    Glyph i uses bitmap i % DISTINCT_BITMAPS, so the last DUPLICATE_BITMAPS
+    glyphs repeat the first ones.
+    """
+    glyph_names = ['.notdef'] + [f'emoji{i}' for i in range(DISTINCT_BITMAPS + DUPLICATE_BITMAPS)]
+    emoji_names = glyph_names[1:]
+
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(glyph_names)
+    builder.setupCharacterMap({0x1F600 + i: name for i, name in enumerate(emoji_names)})
+    builder.setupGlyf({name: TTGlyphPen(None).glyph() for name in glyph_names})
+    builder.setupHorizontalMetrics({name: (1000, 0) for name in glyph_names})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({'familyName': 'Test Emoji', 'styleName': 'Regular'})
+    builder.setupOS2()
+    builder.setupPost()
+    font = builder.font
+
+    cblc = newTable('CBLC')
+    cblc.version = 3.0
+    cblc.strikes = []
+    cbdt = newTable('CBDT')
+    cbdt.version = 3.0
+    cbdt.strikeData = []
+
+    for size in strike_sizes:
+        line_metrics = SbitLineMetrics()
+        for field in LINE_METRICS_FIELDS:
+            setattr(line_metrics, field, 0)
+        line_metrics.ascender = 100
+        line_metrics.descender = -20
+        line_metrics.widthMax = size
+
+        size_table = BitmapSizeTable()
+        size_table.colorRef = 0
+        size_table.hori = line_metrics
+        size_table.vert = line_metrics
+        size_table.ppemX = size_table.ppemY = size
+        size_table.bitDepth = 32
+        size_table.flags = 1
+
+        index_subtable = eblc_index_sub_table_1(None, font)
+        index_subtable.indexFormat = 1
+        index_subtable.imageFormat = 17
+        index_subtable.names = emoji_names
+
+        strike = Strike()
+        strike.bitmapSizeTable = size_table
+        strike.indexSubTables = [index_subtable]
+        cblc.strikes.append(strike)
+
+        strike_data = {}
+        for i, name in enumerate(emoji_names):
+            bitmap = i % DISTINCT_BITMAPS
+            png_data = _png(size, (bitmap % 256, bitmap // 256, 200, 255))
+            # SmallGlyphMetrics: height, width, BearingX, BearingY, Advance
+            record = struct.pack('>BBbbBL', size, size, 0, size * 4 // 5, size, len(png_data))
+            strike_data[name] = cbdt_bitmap_format_17(record + png_data, font)
+        cbdt.strikeData.append(strike_data)
+
+    font['CBLC'] = cblc
+    font['CBDT'] = cbdt
+
+    buffer = io.BytesIO()
+    font.save(buffer)
+    return buffer.getvalue()
+
+
+def _convert(font_bytes, quiet=True):
+    """Resize the strikes of a font and return the reloaded output"""
+    font = TTFont(io.BytesIO(font_bytes))
+    assert fix_cbdt_cblc_sizes_for_directwrite(font, quiet=quiet)
+
+    buffer = io.BytesIO()
+    font.save(buffer)
+    buffer.seek(0)
+    return TTFont(buffer)
+
+
+class TestResizeRoundTrip:
+    """Round-trip tests for resizing CBDT strikes"""
+
+    @classmethod
+    def setup_class(cls):
+        """Build the synthetic font once; encoding its PNGs dominates the run time"""
+        cls.font_bytes = _build_cbdt_font([137, 48])
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        with patch('os.cpu_count', return_value=1):
+            self.output = _convert(self.font_bytes)
+
+    def test_resized_strike_reloads_at_new_size(self):
+        """Test that a 137 ppem strike is rewritten as 128 ppem with 128x128 PNGs"""
+        assert self.output['CBLC'].strikes[0].bitmapSizeTable.ppemX == 128
+        assert self.output['CBLC'].strikes[0].bitmapSizeTable.ppemY == 128
+
+        strike_data = self.output['CBDT'].strikeData[0]
+        assert len(strike_data) == DISTINCT_BITMAPS + DUPLICATE_BITMAPS
+        for bitmap_glyph in strike_data.values():
+            bitmap_glyph.ensureDecompiled()
+            assert Image.open(io.BytesIO(bitmap_glyph.imageData)).size == (128, 128)
+
+    def test_resized_strike_metrics_are_scaled(self):
+        """Test that glyph metrics follow the resized bitmaps"""
+        bitmap_glyph = self.output['CBDT'].strikeData[0]['emoji0']
+        bitmap_glyph.ensureDecompiled()
+
+        assert bitmap_glyph.metrics.width == 128
+        assert bitmap_glyph.metrics.height == 128
+        assert bitmap_glyph.metrics.BearingX == 0
+        assert bitmap_glyph.metrics.BearingY == round(109 * 128 / 137)
+        assert bitmap_glyph.metrics.Advance == 128
+
+    def test_compatible_strike_is_unchanged(self):
+        """Test that a strike already at a DirectWrite size is left alone"""
+        source = TTFont(io.BytesIO(self.font_bytes))
+
+        assert self.output['CBLC'].strikes[1].bitmapSizeTable.ppemX == 48
+        for name, bitmap_glyph in self.output['CBDT'].strikeData[1].items():
+            assert bitmap_glyph.data == source['CBDT'].strikeData[1][name].data
+
+    def test_duplicate_bitmaps_are_resized_alike(self):
+        """Test that glyphs sharing a bitmap get the same resized record"""
+        strike_data = self.output['CBDT'].strikeData[0]
+
+        for i in range(DUPLICATE_BITMAPS):
+            duplicate = strike_data[f'emoji{DISTINCT_BITMAPS + i}']
+            original = strike_data[f'emoji{i}']
+            assert duplicate.data == original.data
+
+    @pytest.mark.parametrize('ipc_threshold', ['0', '1000000'])
+    def test_parallel_matches_in_process(self, ipc_threshold, capsys):
+        """Test that the process pool and thread pool paths match the in-process path"""
+        with patch('os.cpu_count', return_value=4), \
+             patch.dict(os.environ, {'EMOJI_WIN_IPC_THRESHOLD': ipc_threshold}):
+            parallel = _convert(self.font_bytes, quiet=False)
+
+        assert 'Parallel resize unavailable' not in capsys.readouterr().out
+
+        for tag in ('CBDT', 'CBLC'):
+            assert parallel.reader[tag] == self.output.reader[tag]
+
+
+class TestScaleRecordMetrics:
+    """Test cases for scale_record_metrics"""
+
+    def test_small_metrics(self):
+        """Test scaling a format 17 SmallGlyphMetrics header"""
+        header = struct.pack('>BBbbB', 137, 137, 2, 109, 137)
+
+        scaled = scale_record_metrics(header, 128, 128)
+
+        assert struct.unpack('>BBbbB', scaled) == (128, 128, 2, 102, 128)
+
+    def test_big_metrics(self):
+        """Test scaling a format 18 BigGlyphMetrics header"""
+        header = struct.pack('>BBbbBbbB', 52, 52, 0, 40, 52, -26, 0, 52)
+
+        scaled = scale_record_metrics(header, 48, 48)
+
+        assert struct.unpack('>BBbbBbbB', scaled) == (48, 48, 0, 37, 48, -24, 0, 48)
+
+    def test_header_without_metrics(self):
+        """Test that a format 19 header (no metrics) is returned unchanged"""
+        assert scale_record_metrics(b'', 128, 128) == b''
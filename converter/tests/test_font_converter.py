@@ -0,0 +1,62 @@
+"""
+Tests for the font converter cmap handling
+
+This module covers how _ensure_windows_compatible_cmap treats fonts whose
+cmap has repeated (platformID, platEncID) subtables.
+"""
+
+import pytest
+from fontTools.ttLib import newTable
+from fontTools.ttLib.tables._c_m_a_p import CmapSubtable
+
+from emoji_win.font_converter import _ensure_windows_compatible_cmap
+
+
+def _subtable(format, platform_id, encoding_id, mapping):
+    """Create a cmap subtable with the given mapping"""
+    subtable = CmapSubtable.newSubtable(format)
+    subtable.platformID = platform_id
+    subtable.platEncID = encoding_id
+    subtable.language = 0
+    subtable.cmap = dict(mapping)
+    return subtable
+
+
+def _layout(cmap):
+    """Return (platformID, platEncID, format) for every subtable in order"""
+    return [(subtable.platformID, subtable.platEncID, subtable.format) for subtable in cmap.tables]
+
+
+class TestEnsureWindowsCompatibleCmap:
+    """Test cases for _ensure_windows_compatible_cmap"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.cmap = newTable('cmap')
+        self.cmap.tableVersion = 0
+        self.font = {'cmap': self.cmap}
+
+    def test_format12_in_any_unicode_full_subtable(self):
+        """Test that a Format 12 (3, 10) subtable later in the cmap is not duplicated"""
+        self.cmap.tables = [
+            _subtable(4, 3, 10, {0x263A: 'smile'}),
+            _subtable(12, 3, 10, {0x263A: 'smile', 0x1F600: 'grin'}),
+        ]
+
+        _ensure_windows_compatible_cmap(self.font, log=lambda message: None)
+
+        assert _layout(self.cmap) == [(3, 10, 4), (3, 1, 4), (3, 10, 12)]
+
+    def test_last_unicode_full_subtable_is_the_source(self):
+        """Test that the last (3, 10) subtable feeds the BMP and Format 12 subtables"""
+        first = _subtable(4, 3, 10, {0x263A: 'old_smile'})
+        last = _subtable(4, 3, 10, {0x263A: 'smile', 0x1F600: 'grin'})
+        self.cmap.tables = [first, last]
+
+        _ensure_windows_compatible_cmap(self.font, log=lambda message: None)
+
+        assert _layout(self.cmap) == [(3, 10, 12), (3, 1, 4), (3, 10, 4)]
+        assert self.cmap.tables[0].cmap == {0x263A: 'smile', 0x1F600: 'grin'}
+        assert self.cmap.tables[1].cmap == {0x263A: 'smile'}
+        # The surviving source subtable keeps a mapping of its own
+        assert self.cmap.tables[0].cmap is not last.cmap
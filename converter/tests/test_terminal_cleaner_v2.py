@@ -8,7 +8,7 @@ import pytest
 from unittest.mock import Mock, MagicMock, patch, call
 from blessed import Terminal
 import sys
-from io import StringIO
+from io import BytesIO, StringIO, TextIOWrapper
 
 from emoji_win.terminal_cleaner_v2 import TerminalCleanerV2, LineCountingWrapper
 
@@ -21,6 +21,10 @@ class TestTerminalCleanerV2:
         self.mock_term = Mock(spec=Terminal)
         self.cleaner = TerminalCleanerV2(self.mock_term)
     
+    def teardown_method(self):
+        """Restore stdout after each test method"""
+        self.cleaner.reset()
+    
     def test_init(self):
         """Test TerminalCleanerV2 initialization"""
         assert self.cleaner.term is self.mock_term
@@ -47,12 +51,36 @@ class TestTerminalCleanerV2:
         original_stdout = sys.stdout
         
         self.cleaner.start_tracking()
+        wrapper = sys.stdout
         self.cleaner.stop_tracking()
         
         assert not self.cleaner.is_tracking
+        # The wrapper stays installed for the next start_tracking()
+        assert sys.stdout is wrapper
+        
+        self.cleaner.start_tracking()
+        assert sys.stdout is wrapper
+        assert self.cleaner.original_stdout == original_stdout
+        
+        self.cleaner.reset()
         assert sys.stdout == original_stdout
         assert self.cleaner.original_stdout is None
     
+    def test_uninstall(self):
+        """Test uninstall restores stdout and can be called repeatedly"""
+        original_stdout = sys.stdout
+        
+        self.cleaner.start_tracking()
+        self.cleaner.add_lines(2)
+        self.cleaner.uninstall()
+        
+        assert sys.stdout is original_stdout
+        assert not self.cleaner.is_tracking
+        assert self.cleaner.original_stdout is None
+        
+        self.cleaner.uninstall()
+        assert sys.stdout is original_stdout
+    
     def test_add_lines_when_tracking(self):
         """Test manually adding lines when tracking is active"""
         self.cleaner.start_tracking()
@@ -85,66 +113,100 @@ class TestTerminalCleanerV2:
         self.mock_term.move_up = "move_up"
         self.mock_term.clear_eol = "clear_eol"
         
-        self.cleaner.start_tracking()
-        self.cleaner.add_lines(1)
-        
-        with patch('builtins.print') as mock_print:
+        with patch('sys.stdout') as mock_stdout:
+            self.cleaner.start_tracking()
+            self.cleaner.add_lines(1)
+            
             self.cleaner.clear_tracked()
             
-            # Should clear one line without moving up first
-            expected_calls = [
-                call("clear_eol", end='', flush=True)
-            ]
-            mock_print.assert_has_calls(expected_calls)
-        
-        assert self.cleaner.lines_printed == 0
-        self.cleaner.stop_tracking()
+            # Should clear the current line, then move up and clear the tracked one
+            mock_stdout.write.assert_called_once_with("\r" "clear_eol" "move_up" "clear_eol")
+            mock_stdout.flush.assert_called_once()
+            
+            assert self.cleaner.lines_printed == 0
+            self.cleaner.stop_tracking()
     
     def test_clear_tracked_multiple_lines(self):
         """Test clearing multiple tracked lines"""
         self.mock_term.move_up = "move_up"
         self.mock_term.clear_eol = "clear_eol"
         
-        self.cleaner.start_tracking()
-        self.cleaner.add_lines(3)
+        with patch('sys.stdout') as mock_stdout:
+            self.cleaner.start_tracking()
+            self.cleaner.add_lines(3)
+            
+            self.cleaner.clear_tracked()
+            
+            # Should clear the current line, then walk up once over the 3 tracked
+            # lines clearing each, ending on the first line, all in one write
+            expected = (
+                "\r" "clear_eol"        # Clear the current (empty) line
+                "move_up" "clear_eol"   # Move to line 3 and clear it
+                "move_up" "clear_eol"   # Move to line 2 and clear it
+                "move_up" "clear_eol"   # Move to line 1 and clear it
+            )
+            mock_stdout.write.assert_called_once_with(expected)
+            mock_stdout.flush.assert_called_once()
+            
+            assert self.cleaner.lines_printed == 0
+            self.cleaner.stop_tracking()
+    
+    def test_clear_tracked_counted_escapes(self):
+        """Test that ANSI terminals get counted moves and one clear_eos"""
+        self.mock_term.move_up = "move_up"
+        self.mock_term.clear_eol = "clear_eol"
+        self.mock_term.clear_eos = "\x1b[J"
         
-        with patch('builtins.print') as mock_print:
+        with patch('sys.stdout') as mock_stdout:
+            self.cleaner.start_tracking()
+            self.cleaner.add_lines(3)
+            
             self.cleaner.clear_tracked()
             
-            # Should clear 3 lines: first line (no move up), then move up and clear 2 more
-            # Then move up 2 times to get to first line position
-            expected_calls = [
-                call("clear_eol", end='', flush=True),      # Clear line 3 (current)
-                call("move_up", end='', flush=True),        # Move to line 2
-                call("clear_eol", end='', flush=True),      # Clear line 2
-                call("move_up", end='', flush=True),        # Move to line 1
-                call("clear_eol", end='', flush=True),      # Clear line 1
-                call("move_up", end='', flush=True),        # Move up to first line (3-1=2 times)
-                call("move_up", end='', flush=True),        # Move up to first line
-            ]
-            mock_print.assert_has_calls(expected_calls)
+            mock_stdout.write.assert_called_once_with("\r\x1b[3A\x1b[J")
+            self.cleaner.stop_tracking()
+    
+    def test_refresh_capabilities(self):
+        """Test that cached capabilities are re-resolved on refresh"""
+        self.mock_term.move_up = "move_up"
+        self.mock_term.clear_eol = "clear_eol"
         
-        assert self.cleaner.lines_printed == 0
-        self.cleaner.stop_tracking()
+        with patch('sys.stdout') as mock_stdout:
+            self.cleaner.start_tracking()
+            self.cleaner.add_lines(2)
+            self.cleaner.clear_tracked()
+            
+            self.mock_term.move_up = "up"
+            self.mock_term.clear_eol = "eol"
+            self.cleaner.refresh_capabilities()
+            
+            self.cleaner.add_lines(2)
+            self.cleaner.clear_tracked()
+            
+            mock_stdout.write.assert_called_with("\r" "eol" "up" "eol" "up" "eol")
+            self.cleaner.stop_tracking()
     
     def test_clear_tracked_exception_fallback(self):
         """Test fallback when clearing fails"""
         self.mock_term.clear = "clear_screen"
+        self.mock_term.move_up = "move_up"
+        self.mock_term.clear_eol = "clear_eol"
         
-        self.cleaner.start_tracking()
-        self.cleaner.add_lines(2)
-        
-        # Make move_up raise an exception
-        self.mock_term.move_up = Mock(side_effect=Exception("Terminal error"))
-        
-        with patch('builtins.print') as mock_print:
-            self.cleaner.clear_tracked()
+        with patch('sys.stdout') as mock_stdout:
+            self.cleaner.start_tracking()
+            self.cleaner.add_lines(2)
             
-            # Should fallback to clearing screen
-            mock_print.assert_called_with("clear_screen", end='', flush=True)
-        
-        assert self.cleaner.lines_printed == 0
-        self.cleaner.stop_tracking()
+            # Make the write fail
+            mock_stdout.write.side_effect = OSError("Terminal error")
+            
+            with patch('builtins.print') as mock_print:
+                self.cleaner.clear_tracked()
+                
+                # Should fallback to clearing screen
+                mock_print.assert_called_with("clear_screen", end='', flush=True)
+            
+            assert self.cleaner.lines_printed == 0
+            self.cleaner.stop_tracking()
     
     def test_clear_and_redraw(self):
         """Test clear and redraw functionality"""
@@ -167,6 +229,50 @@ class TestTerminalCleanerV2:
         
         self.cleaner.stop_tracking()
     
+    def test_clear_and_redraw_rewrites_changed_lines_only(self):
+        """Test that a redraw with the same shape only rewrites changed lines"""
+        self.mock_term.move_up = "move_up"
+        self.mock_term.clear_eol = "clear_eol"
+        frames = iter([["a", "b", "c"], ["a", "X", "c"]])
+        
+        def draw_function():
+            for line in next(frames):
+                print(line)
+        
+        with patch('sys.stdout') as mock_stdout:
+            self.cleaner.start_tracking()
+            self.cleaner.clear_and_redraw(draw_function)
+            mock_stdout.write.assert_called_once_with("a\nb\nc\n")
+            
+            mock_stdout.write.reset_mock()
+            self.cleaner.clear_and_redraw(draw_function, force=True)
+            mock_stdout.write.assert_called_once_with(
+                "move_up" "move_up" "\r" "clear_eol" "X" "\n\n"
+            )
+            
+            assert self.cleaner.get_line_count() == 3
+            self.cleaner.stop_tracking()
+    
+    def test_clear_and_redraw_throttles_bursts(self):
+        """Test that rapid redraws are skipped until flushed"""
+        first, second, third = Mock(), Mock(), Mock()
+        
+        self.cleaner.min_redraw_interval = 60
+        self.cleaner.start_tracking()
+        self.cleaner.clear_and_redraw(first)
+        self.cleaner.clear_and_redraw(second)
+        self.cleaner.clear_and_redraw(third)
+        
+        first.assert_called_once()
+        second.assert_not_called()
+        third.assert_not_called()
+        
+        self.cleaner.flush_redraw()
+        third.assert_called_once()
+        second.assert_not_called()
+        
+        self.cleaner.stop_tracking()
+    
     def test_get_line_count(self):
         """Test getting current line count"""
         assert self.cleaner.get_line_count() == 0
@@ -234,11 +340,28 @@ class TestLineCountingWrapper:
         assert self.mock_cleaner.lines_printed == 0
         self.mock_stdout.write.assert_called_once_with(text)
     
+    def test_writelines_counts_and_writes_once(self):
+        """Test that writelines is counted and forwarded as one write"""
+        self.wrapper.writelines(["Line 1\n", "Line 2\n"])
+        
+        assert self.mock_cleaner.lines_printed == 2
+        self.mock_stdout.write.assert_called_once_with("Line 1\nLine 2\n")
+    
     def test_flush(self):
         """Test flush method"""
         self.wrapper.flush()
         self.mock_stdout.flush.assert_called_once()
     
+    def test_encoding_follows_reconfigure(self):
+        """Test that encoding and errors reflect a reconfigured stream"""
+        stream = TextIOWrapper(BytesIO(), encoding='ascii', errors='strict')
+        wrapper = LineCountingWrapper(stream, self.mock_cleaner)
+        
+        stream.reconfigure(encoding='utf-8', errors='replace')
+        
+        assert wrapper.encoding == 'utf-8'
+        assert wrapper.errors == 'replace'
+    
     def test_getattr_delegation(self):
         """Test that other attributes are delegated to original stdout"""
         self.mock_stdout.some_attribute = "test_value"
@@ -254,6 +377,10 @@ class TestTerminalCleanerV2Integration:
         self.real_term = Terminal()
         self.cleaner = TerminalCleanerV2(self.real_term)
 
+    def teardown_method(self):
+        """Restore stdout after each test"""
+        self.cleaner.reset()
+
     def test_real_terminal_clear_single_line(self):
         """Test clearing a single line of content in real terminal"""
         # Start tracking
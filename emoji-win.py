@@ -17,16 +17,21 @@ Author: jjjuk
 License: MIT
 """
 
+import os
 import sys
 import subprocess
 from pathlib import Path
 
+# Paths and the uv command prefix don't change between calls
+_SCRIPT_DIR = Path(__file__).parent
+_CONVERTER_DIR = _SCRIPT_DIR / "converter"
+_CMD_PREFIX = ("uv", "run", "python", "-m", "emoji_win")
+
 def main():
     """Main entry point that delegates to uv in the converter directory"""
 
-    # Get paths
-    script_dir = Path(__file__).parent
-    converter_dir = script_dir / "converter"
+    script_dir = _SCRIPT_DIR
+    converter_dir = _CONVERTER_DIR
 
     # Check if converter directory exists
     if not converter_dir.exists():
@@ -35,15 +40,23 @@ def main():
         return 1
 
     # Build the uv command - pass arguments as-is, no path manipulation
-    cmd = ["uv", "run", "python", "-m", "emoji_win"] + sys.argv[1:]
+    cmd = [*_CMD_PREFIX, *sys.argv[1:]]
+
+    # Add converter to Python path; uv inherits our environment
+    os.environ["PYTHONPATH"] = str(converter_dir)
 
     try:
         # Run uv from the project root directory (not converter)
         # This way all paths work naturally from the user's perspective
+        if os.name != "nt":
+            # Replace this process with uv instead of waiting on a child;
+            # execvp only returns by raising (e.g. FileNotFoundError)
+            os.chdir(script_dir)
+            os.execvp(cmd[0], cmd)
+
         result = subprocess.run(
             cmd,
             cwd=script_dir,  # Run from project root
-            env={**subprocess.os.environ, "PYTHONPATH": str(converter_dir)},  # Add converter to Python path
             check=False  # Don't raise exception on non-zero exit
         )
         return result.returncode